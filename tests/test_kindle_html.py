@@ -0,0 +1,74 @@
+"""Tests for the Kindle HTML notebook parser."""
+
+from pathlib import Path
+
+import pytest
+
+from tsc.parsers import parse_kindle_html
+from tsc.parsers.models import HighlightColor
+
+
+_HEADER = (
+    "<?xml version='1.0' encoding='UTF-8' ?>\n"
+    "<html><head><meta charset='UTF-8'></head><body>"
+)
+
+_METADATA = "<div class='bookTitle'>The Book</div><div class='authors'>An Author</div>"
+
+_NOTES_WELL_FORMED = """
+<h2 class='sectionHeading'>Chapter 1</h2>
+<h3 class='noteHeading'>Highlight (<span class='highlight_pink'>pink</span>) - Page 3 · Location 40</h3>
+<div class='noteText'>First text</div>
+<h3 class='noteHeading'>Note - Location 40</h3>
+<div class='noteText'>A user note</div>
+<h3 class='noteHeading'>Highlight (blue) - Location 41</h3>
+<div class='noteText'>Second text</div>
+"""
+
+# Kindle's malformed layout: each note text div opens inside its heading
+_NOTES_MALFORMED = """
+<h2 class='sectionHeading'>Chapter 1</h2>
+<h3 class='noteHeading'>Highlight (<span class='highlight_pink'>pink</span>) - Page 3 · Location 40</div><div class='noteText'>First text</h3>
+<h3 class='noteHeading'>Note - Location 40</div><div class='noteText'>A user note</h3>
+<h3 class='noteHeading'>Highlight (blue) - Location 41</div><div class='noteText'>Second text</h3>
+"""
+
+
+def _export(notes: str, wrapped: bool) -> str:
+    """Build a notebook export, optionally inside a bodyContainer div."""
+    body = _METADATA + notes
+    if wrapped:
+        body = f"<div class='bodyContainer'>{body}</div>"
+    return f"{_HEADER}{body}</body></html>"
+
+
+@pytest.mark.parametrize("wrapped", [True, False], ids=["wrapped", "unwrapped"])
+@pytest.mark.parametrize(
+    "notes",
+    [_NOTES_WELL_FORMED, _NOTES_MALFORMED],
+    ids=["well_formed", "malformed"],
+)
+def test_parses_highlights(tmp_path: Path, notes: str, wrapped: bool):
+    path = tmp_path / "book.html"
+    path.write_text(_export(notes, wrapped), encoding="utf-8")
+
+    book = parse_kindle_html(path)
+
+    assert book.metadata.title == "The Book"
+    assert book.metadata.author == "An Author"
+    assert [(h.text, h.color, h.page, h.location, h.chapter) for h in book.highlights] == [
+        ("First text", HighlightColor.PINK, 3, 40, "Chapter 1"),
+        ("Second text", HighlightColor.BLUE, None, 41, "Chapter 1"),
+    ]
+    assert book.highlights_by_color()[HighlightColor.PINK] == book.highlights[:1]
+
+
+def test_empty_export(tmp_path: Path):
+    path = tmp_path / "empty.html"
+    path.write_bytes(b"")
+
+    book = parse_kindle_html(path)
+
+    assert book.metadata.title == "Unknown Title"
+    assert book.metadata.author == "Unknown Author"
+    assert book.highlights == []
@@ -0,0 +1,66 @@
+"""Tests for batched concept template filling."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+import tsc.generators.template_filler as template_filler
+from tsc.config import get_settings
+from tsc.parsers.models import BookMetadata
+from tsc.processors.concept_extractor import ExtractedConcept
+
+
+_FIELDS = {
+    name: [] if name in ("connections_supportive", "connections_contrasting", "open_questions") else "x"
+    for name in template_filler.FilledTemplate.model_fields
+}
+
+_METADATA = BookMetadata(title="The Book", author="An Author", source_file=Path("book.html"))
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the LLM cache at a temporary directory."""
+    monkeypatch.setattr(type(get_settings()), "llm_cache_dir", property(lambda self: tmp_path))
+    return tmp_path
+
+
+def _concepts(n: int) -> list[ExtractedConcept]:
+    return [
+        ExtractedConcept(name=f"Concept {i}", description="d", supporting_highlights=[], relevance_score=0.5)
+        for i in range(n)
+    ]
+
+
+def test_truncated_batch_falls_back_per_concept(cache_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    batch_prompts = []
+
+    async def fake_query_llm(prompt: str, max_tokens: int = 4096) -> str:
+        if '"results"' in prompt:
+            batch_prompts.append(prompt)
+            return '{"results": [{"id": 0, "trivium_gram'
+        return json.dumps(_FIELDS)
+
+    monkeypatch.setattr(template_filler, "query_llm", fake_query_llm)
+
+    filled = asyncio.run(template_filler.fill_templates(_concepts(3), [], _METADATA, "profile", []))
+
+    assert len(batch_prompts) == 1
+    assert all(f == template_filler.FilledTemplate(**_FIELDS) for f in filled)
+    # The failed batch is not cached, so a later run asks again
+    assert not list((cache_dir / "templates_batch").rglob("*.json"))
+
+
+def test_malformed_results_left_for_fallback(cache_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    async def fake_query_llm(prompt: str, max_tokens: int = 4096) -> str:
+        return json.dumps({"results": [dict(_FIELDS, id=0), {"id": 1, "trivium_grammar": "x"}, "junk"]})
+
+    monkeypatch.setattr(template_filler, "query_llm", fake_query_llm)
+
+    results = asyncio.run(
+        template_filler._fill_templates_chunk(_concepts(3), [], _METADATA, "profile", [])
+    )
+
+    assert [r is not None for r in results] == [True, False, False]
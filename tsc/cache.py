@@ -0,0 +1,144 @@
+"""On-disk cache for LLM-backed results."""
+
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, get_type_hints
+
+from pydantic import BaseModel, TypeAdapter
+
+from tsc.config import get_settings
+from tsc.integrations.llm_client import MODEL
+
+
+# Process-wide cache behaviour, set from the CLI
+_enabled = True
+_refresh = False
+
+
+def configure_cache(enabled: bool = True, refresh: bool = False) -> None:
+    """Configure LLM result caching for this process.
+
+    Args:
+        enabled: If False, bypass the cache entirely.
+        refresh: If True, ignore existing entries but store fresh results.
+    """
+    global _enabled, _refresh
+    _enabled = enabled
+    _refresh = refresh
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert call arguments into a stable JSON-serializable form."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _jsonable(dataclasses.asdict(value))
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _is_fresh(path: Path, ttl_days: int) -> bool:
+    """Check whether a cache entry exists and has not expired."""
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    return not ttl_days or time.time() - mtime < ttl_days * 86400
+
+
+def _write_entry(path: Path, data: bytes) -> None:
+    """Atomically write a cache entry.
+
+    The entry is written to a temporary file in the same directory and
+    swapped into place, so concurrent runs or a crash never leave a
+    truncated entry behind.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def disk_cache(
+    namespace: str,
+    version: int = 1,
+    key: Optional[Callable[..., Any]] = None,
+    cache_if: Optional[Callable[[Any], bool]] = None,
+) -> Callable:
+    """Cache an async LLM-backed function's results on disk.
+
+    Entries are content-addressed by a SHA-256 hash of the namespace, prompt
+    version, LLM mode/model and the bound call arguments, and stored as JSON
+    under ``.llm_cache/{namespace}/{hash[:2]}/{hash}.json``. Bump ``version``
+    whenever the function's prompt changes so stale entries are not reused.
+    Entries older than ``llm_cache_ttl_days`` are recomputed, and setting
+    ``TSC_LLM_CACHE=0`` disables the cache.
+
+    Args:
+        namespace: Cache subdirectory for this function.
+        version: Prompt template version.
+        key: Optional function called with the bound arguments as keywords,
+            returning the values that determine the result. Defaults to
+            all arguments.
+        cache_if: Optional predicate on a fresh result; results it rejects
+            are returned but not stored. Defaults to storing every result.
+
+    Returns:
+        Decorator for an async function with a return type annotation.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        adapter = TypeAdapter(get_type_hints(func)["return"])
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            settings = get_settings()
+            if not (_enabled and settings.tsc_llm_cache):
+                return await func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            cache_args = key(**bound.arguments) if key else bound.arguments
+            cache_key = json.dumps(
+                {
+                    "namespace": namespace,
+                    "version": version,
+                    "llm": f"{settings.llm_mode}:{MODEL}",
+                    "args": _jsonable(cache_args),
+                },
+                sort_keys=True,
+            )
+            digest = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+            path = settings.llm_cache_dir / namespace / digest[:2] / f"{digest}.json"
+
+            if not _refresh and _is_fresh(path, settings.llm_cache_ttl_days):
+                try:
+                    return adapter.validate_json(path.read_bytes())
+                except Exception:
+                    pass  # Unreadable entry, recompute below
+
+            result = await func(*args, **kwargs)
+            if cache_if is None or cache_if(result):
+                _write_entry(path, adapter.dump_json(result))
+            return result
+
+        return wrapper
+
+    return decorator
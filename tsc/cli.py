@@ -1,29 +1,31 @@
 """CLI interface for The Silent Cartographer."""
 
+from __future__ import annotations
+
 import asyncio
+import os
 import shutil
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-
-from tsc.config import get_settings
-from tsc.parsers import parse_kindle_html, ParsedBook
-from tsc.processors import route_highlights
-from tsc.processors.concept_extractor import extract_concepts, ExtractedConcept
-from tsc.processors.action_extractor import extract_actions, ExtractedAction
-from tsc.generators.book_note import write_book_note
-from tsc.generators.concept_note import write_concept_note
-from tsc.generators.template_filler import fill_template
-from tsc.integrations.asana_client import create_task
-from tsc.integrations.email_client import send_notification, EmailClient
-from tsc.integrations.semantic_search import SemanticSearch
-from tsc.memory import MemoryTracker, ProcessedRecord, SpacedRepetitionEntry
+
+# Heavy dependencies (Rich, pydantic, lxml, the Asana SDK, ...) are
+# imported inside the commands that use them to keep CLI startup fast
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress, TaskID
+
+    from tsc.config import Settings
+    from tsc.generators.template_filler import FilledTemplate
+    from tsc.integrations.email_client import EmailClient
+    from tsc.integrations.semantic_search import SemanticSearch, SemanticTemplateCache
+    from tsc.memory import MemoryTracker, ProcessedRecord
+    from tsc.parsers import Highlight, ParsedBook
+    from tsc.processors.action_extractor import ExtractedAction
+    from tsc.processors.concept_extractor import ExtractedConcept
+    from tsc.processors.highlight_router import RoutedHighlights
 
 
 # Force UTF-8 output on Windows
@@ -31,16 +33,23 @@ if sys.platform == "win32":
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
     sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
-console = Console(force_terminal=True)
+_console: Optional[Console] = None
 
 
-def _print_banner() -> None:
-    """Print Halo-themed ASCII art banner."""
-    width = shutil.get_terminal_size().columns
+def _get_console() -> Console:
+    """Get the shared Rich console, creating it on first use."""
+    global _console
+
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console(force_terminal=True)
+
+    return _console
 
-    if width >= 100:
-        # Full large banner with filled block letters
-        banner = """[bold cyan] ████████╗██╗  ██╗███████╗    ███████╗██╗██╗     ███████╗███╗   ██╗████████╗
+
+# Full large banner with filled block letters
+_BANNER_LARGE = """ ████████╗██╗  ██╗███████╗    ███████╗██╗██╗     ███████╗███╗   ██╗████████╗
  ╚══██╔══╝██║  ██║██╔════╝    ██╔════╝██║██║     ██╔════╝████╗  ██║╚══██╔══╝
     ██║   ███████║█████╗      ███████╗██║██║     █████╗  ██╔██╗ ██║   ██║
     ██║   ██╔══██║██╔══╝      ╚════██║██║██║     ██╔══╝  ██║╚██╗██║   ██║
@@ -52,42 +61,109 @@ def _print_banner() -> None:
      ██║     ███████║██████╔╝   ██║   ██║   ██║██║  ███╗██████╔╝███████║██████╔╝███████║█████╗  ██████╔╝
      ██║     ██╔══██║██╔══██╗   ██║   ██║   ██║██║   ██║██╔══██╗██╔══██║██╔═══╝ ██╔══██║██╔══╝  ██╔══██╗
      ╚██████╗██║  ██║██║  ██║   ██║   ╚██████╔╝╚██████╔╝██║  ██║██║  ██║██║     ██║  ██║███████╗██║  ██║
-      ╚═════╝╚═╝  ╚═╝╚═╝  ╚═╝   ╚═╝    ╚═════╝  ╚═════╝ ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝     ╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝[/bold cyan]"""
-        console.print(banner)
+      ╚═════╝╚═╝  ╚═╝╚═╝  ╚═╝   ╚═╝    ╚═════╝  ╚═════╝ ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝     ╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝"""
+
+# Compact banner for narrow terminals
+_BANNER_SMALL = """[bold cyan]╔════════════════════════════════════════╗[/bold cyan]
+[bold cyan]║[/bold cyan]      [bold white]THE SILENT CARTOGRAPHER[/bold white]           [bold cyan]║[/bold cyan]
+[bold cyan]║[/bold cyan]  [dim cyan]◆━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━◆[/dim cyan]   [bold cyan]║[/bold cyan]
+[bold cyan]║[/bold cyan]    [white]Where knowledge hides, I reveal[/white]   [bold cyan]║[/bold cyan]
+[bold cyan]╚════════════════════════════════════════╝[/bold cyan]"""
+
+
+def _print_banner() -> None:
+    """Print Halo-themed ASCII art banner."""
+    # The banner is decorative, so skip it when output is piped or redirected
+    if not sys.stdout.isatty():
+        return
+
+    console = _get_console()
+
+    if shutil.get_terminal_size().columns >= 100:
+        # Plain text, so bypass Rich's markup parsing
+        console.out(_BANNER_LARGE, style="bold cyan", highlight=False)
         console.print()
         console.print("[dim cyan]                    ◇ ▽ ○ ◆ △ ● ◇ ▽ ○ ◆ △ ● ◇ ▽ ○ ◆ △ ● ◇[/dim cyan]")
         console.print("[bold white]                    Cartographic analysis pending Reclaimer directive[/bold white]")
     else:
-        # Compact banner for narrow terminals
-        console.print("[bold cyan]╔════════════════════════════════════════╗[/bold cyan]")
-        console.print("[bold cyan]║[/bold cyan]      [bold white]THE SILENT CARTOGRAPHER[/bold white]           [bold cyan]║[/bold cyan]")
-        console.print("[bold cyan]║[/bold cyan]  [dim cyan]◆━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━◆[/dim cyan]   [bold cyan]║[/bold cyan]")
-        console.print("[bold cyan]║[/bold cyan]    [white]Where knowledge hides, I reveal[/white]   [bold cyan]║[/bold cyan]")
-        console.print("[bold cyan]╚════════════════════════════════════════╝[/bold cyan]")
+        console.print(_BANNER_SMALL)
 
     console.print()
 
 
-def _load_profile() -> str:
+def _load_profile(settings: Settings) -> str:
     """Load user profile content."""
-    settings = get_settings()
     try:
         return settings.tsc_profile_path.read_text(encoding="utf-8")
     except FileNotFoundError:
-        console.print("[yellow]Warning: profile.md not found, using empty profile[/yellow]")
+        _get_console().print("[yellow]Warning: profile.md not found, using empty profile[/yellow]")
         return ""
 
 
+def _iter_html_files(directory: Path) -> Iterator[Path]:
+    """Yield HTML exports in a directory as they are found.
+
+    Uses a single os.scandir pass; the extension match is case-insensitive.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(".html") and entry.is_file():
+                yield Path(entry.path)
+
+
+def _print_highlight_counts(file_path: Path, counts: dict[str, int]) -> None:
+    """Print the per-color highlight summary for a book."""
+    console = _get_console()
+    console.print(f"\n[bold blue]Processing:[/bold blue] {file_path.name}")
+    console.print(f"  Found {sum(counts.values())} highlights:")
+    console.print(f"    🟡 Yellow (concepts): {counts['yellow']}")
+    console.print(f"    🩷 Pink (actions): {counts['pink']}")
+    console.print(f"    🔵 Blue (quotes): {counts['blue']}")
+    console.print(f"    🟠 Orange (disagreements): {counts['orange']}")
+
+
+async def _no_results() -> list:
+    """Stand in for an extraction that has nothing to extract."""
+    return []
+
+
 async def _process_single_book(
     file_path: Path,
+    settings: Settings,
+    book: ParsedBook,
+    routed: RoutedHighlights,
+    tracker: MemoryTracker,
+    search: SemanticSearch,
+    profile: str,
+    progress: Progress,
+    task: TaskID,
+    concepts: Optional[list[ExtractedConcept]] = None,
+    actions: Optional[list[ExtractedAction]] = None,
+    template_cache: Optional[SemanticTemplateCache] = None,
+    email_client: Optional[EmailClient] = None,
     dry_run: bool = False,
     skip_email: bool = False,
     skip_asana: bool = False,
 ) -> Optional[ProcessedRecord]:
-    """Process a single Kindle HTML export.
+    """Process a single parsed Kindle export.
 
     Args:
         file_path: Path to HTML file.
+        settings: Application settings.
+        book: The parsed book.
+        routed: The book's highlights routed by color.
+        tracker: Memory tracker shared by all books in this run.
+        search: Vault search shared by all books in this run.
+        profile: User profile content.
+        progress: Progress display shared by all books in this run.
+        task: Progress task reporting this book's status.
+        concepts: Concepts already extracted for this book, if any.
+            Extracted here when None.
+        actions: Actions already extracted for this book, if any.
+            Extracted here when None.
+        template_cache: Semantic cache of filled templates, if enabled.
+        email_client: Email client shared by all books in this run, if
+            email is configured.
         dry_run: If True, preview without writing.
         skip_email: Skip email notification.
         skip_asana: Skip Asana task creation.
@@ -95,193 +171,345 @@ async def _process_single_book(
     Returns:
         ProcessedRecord if successful, None otherwise.
     """
-    settings = get_settings()
-    tracker = MemoryTracker()
-
-    # Check if already processed
-    if tracker.is_processed(file_path.name):
-        console.print(f"[yellow]Skipping (already processed): {file_path.name}[/yellow]")
-        return None
-
-    console.print(f"\n[bold blue]Processing:[/bold blue] {file_path.name}")
-
-    # Parse the HTML
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Parsing HTML...", total=None)
-        book = parse_kindle_html(file_path)
-        progress.update(task, description="✓ Parsed HTML")
-
+    from tsc.generators.book_note import write_book_note
+    from tsc.generators.concept_note import write_concept_note
+    from tsc.generators.template_filler import fill_templates
+    from tsc.integrations.asana_client import create_tasks
+    from tsc.integrations.email_client import send_notification
+    from tsc.memory import ProcessedRecord, SpacedRepetitionEntry
+    from tsc.processors.action_extractor import extract_actions
+    from tsc.processors.concept_extractor import extract_concepts
+
+    console = _get_console()
+    name = file_path.name
     counts = book.highlight_counts()
-    console.print(f"  Found {sum(counts.values())} highlights:")
-    console.print(f"    🟡 Yellow (concepts): {counts['yellow']}")
-    console.print(f"    🩷 Pink (actions): {counts['pink']}")
-    console.print(f"    🔵 Blue (quotes): {counts['blue']}")
-    console.print(f"    🟠 Orange (disagreements): {counts['orange']}")
 
-    # Route highlights
-    routed = route_highlights(book)
-
-    # Load profile and existing notes
-    profile = _load_profile()
-    search = SemanticSearch()
+    # Load existing notes
     existing_notes = search.get_all_note_titles()
 
-    # Extract concepts from yellow highlights
-    concepts: list[ExtractedConcept] = []
-    if routed.concepts:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Extracting concepts...", total=None)
-            concepts = await extract_concepts(
-                routed.concepts,
-                book.metadata,
-                profile,
-            )
-            progress.update(task, description=f"✓ Extracted {len(concepts)} concepts")
-
-    # Extract actions from pink highlights
-    actions: list[ExtractedAction] = []
-    if routed.actions:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Extracting actions...", total=None)
-            actions = await extract_actions(
-                routed.actions,
-                book.metadata,
-                profile,
-            )
-            progress.update(task, description=f"✓ Extracted {len(actions)} actions")
+    # Extract concepts from yellow and actions from pink highlights when the
+    # batch didn't; the two are independent, so their requests overlap
+    need_concepts = concepts is None and bool(routed.concepts)
+    need_actions = actions is None and bool(routed.actions)
+    if need_concepts or need_actions:
+        progress.update(task, description=f"{name}: Extracting concepts and actions...")
+        extracted_concepts, extracted_actions = await asyncio.gather(
+            extract_concepts(routed.concepts, book.metadata, profile)
+            if need_concepts else _no_results(),
+            extract_actions(routed.actions, book.metadata, profile)
+            if need_actions else _no_results(),
+        )
+        if need_concepts:
+            concepts = extracted_concepts
+        if need_actions:
+            actions = extracted_actions
+    if concepts is None:
+        concepts = []
+    if actions is None:
+        actions = []
 
     if dry_run:
-        console.print("\n[yellow][DRY RUN] Would create:[/yellow]")
-        console.print(f"  Book note: {book.metadata.title}.md")
-        for c in concepts:
-            console.print(f"  Concept note: {c.name}.md")
-        for a in actions:
-            console.print(f"  Asana task: {a.title}")
+        lines = [
+            f"\n[yellow][DRY RUN] {name} would create:[/yellow]",
+            f"  Book note: {book.metadata.title}.md",
+        ]
+        lines.extend(f"  Concept note: {c.name}.md" for c in concepts)
+        lines.extend(f"  Asana task: {a.title}" for a in actions)
+        console.print("\n".join(lines))
+        progress.update(task, description=f"[yellow]{name}: dry run complete[/yellow]")
         return None
 
     # Create Asana tasks
     asana_urls: dict[str, str] = {}
     if actions and not skip_asana:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Creating Asana tasks...", total=None)
-            for action in actions:
-                # Get the source highlight text
-                highlight_text = ""
-                if action.source_highlight < len(routed.actions):
-                    highlight_text = routed.actions[action.source_highlight].text
-                url = await create_task(action, book.metadata, highlight_text)
-                if url:
-                    asana_urls[action.title] = url
-            progress.update(task, description=f"✓ Created {len(asana_urls)} Asana tasks")
-
-    # Generate concept notes
-    concept_names: list[str] = []
+        progress.update(task, description=f"{name}: Creating {len(actions)} Asana tasks...")
+        # Pair each action with its source highlight text
+        action_texts = [h.text for h in routed.actions]
+        n_a = len(action_texts)
+        pairs = [
+            (
+                action,
+                action_texts[action.source_highlight]
+                if action.source_highlight < n_a else "",
+            )
+            for action in actions
+        ]
+        urls = await create_tasks(pairs, book.metadata)
+        asana_urls = {
+            action.title: url for action, url in zip(actions, urls) if url
+        }
+        console.print(f"[green]✓ Created {len(asana_urls)} Asana tasks for:[/green] {name}")
+
+    # Fill concept templates
+    supportings: list[list[Highlight]] = []
+    filled_list: list[Optional[FilledTemplate]] = []
     if concepts:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Generating concept notes...", total=len(concepts))
-            for i, concept in enumerate(concepts):
-                progress.update(task, description=f"Generating: {concept.name}")
-
-                # Fill template
-                filled = await fill_template(
-                    concept,
-                    routed.concepts,
-                    book.metadata,
-                    profile,
-                    existing_notes,
-                )
+        progress.update(
+            task,
+            description=f"{name}: Filling {len(concepts)} concept templates...",
+        )
+
+        # Get supporting highlights by index
+        concept_highlights = routed.concepts
+        n_c = len(concept_highlights)
+        supportings = [
+            [concept_highlights[i] for i in concept.supporting_highlights if i < n_c]
+            for concept in concepts
+        ]
+
+        # Reuse templates from near-duplicate concepts where possible;
+        # embedding is blocking, so it runs off the event loop
+        filled_list = [None] * len(concepts)
+        if template_cache:
+            filled_list = await asyncio.to_thread(
+                template_cache.lookup, concepts, book.metadata, supportings,
+            )
 
-                # Get supporting highlights by index
-                supporting = [
-                    routed.concepts[i] for i in concept.supporting_highlights
-                    if i < len(routed.concepts)
-                ]
-
-                # Write note
-                note_path = write_concept_note(
-                    concept,
-                    filled,
-                    book.metadata,
-                    settings.ideas_dir,
-                    supporting,
-                )
-                concept_names.append(concept.name)
-
-                # Add to spaced repetition
-                tracker.add_spaced_repetition_entry(SpacedRepetitionEntry(
-                    concept_name=concept.name,
-                    concept_path=str(note_path),
-                    source_book=book.metadata.title,
-                ))
-
-                progress.advance(task)
-
-            progress.update(task, description=f"✓ Generated {len(concepts)} concept notes")
-
-    # Generate book note
-    book_note_path = write_book_note(
-        book,
-        concepts,
-        actions,
-        settings.books_dir,
-        asana_urls,
+        # Fill the remaining templates, several concepts per LLM request
+        misses = [i for i, filled in enumerate(filled_list) if filled is None]
+        fresh = await fill_templates(
+            [concepts[i] for i in misses],
+            routed.concepts,
+            book.metadata,
+            profile,
+            existing_notes,
+        )
+        for i, filled in zip(misses, fresh):
+            filled_list[i] = filled
+        if template_cache and misses:
+            await asyncio.to_thread(
+                template_cache.add, [concepts[i] for i in misses], fresh, book.metadata,
+            )
+
+    # Write the book note and all concept notes in parallel, off the event loop
+    books_dir = settings.books_dir
+    ideas_dir = settings.ideas_dir
+    progress.update(task, description=f"{name}: Writing notes...")
+    book_note_path, *note_paths = await asyncio.gather(
+        asyncio.to_thread(
+            write_book_note,
+            book,
+            concepts,
+            actions,
+            books_dir,
+            asana_urls,
+            counts=counts,
+        ),
+        *(
+            asyncio.to_thread(
+                write_concept_note,
+                concept,
+                filled,
+                book.metadata,
+                ideas_dir,
+                supporting,
+            )
+            for concept, filled, supporting in zip(concepts, filled_list, supportings)
+        ),
     )
+    if concepts:
+        search.invalidate()
     console.print(f"[green]✓ Created book note:[/green] {book_note_path.name}")
 
     # Create processing record
     record = ProcessedRecord(
-        source_file=file_path.name,
+        source_file=name,
         book_title=book.metadata.title,
         book_author=book.metadata.author,
         highlight_counts=counts,
-        concepts_created=concept_names,
+        concepts_created=[c.name for c in concepts],
         actions_created=[a.title for a in actions],
         book_note_path=str(book_note_path),
     )
 
-    # Save to memory
-    tracker.add_processed_record(record)
+    # Save to memory with a single write
+    with tracker.batch():
+        tracker.extend_spaced_repetition_entries([
+            SpacedRepetitionEntry(
+                concept_name=concept.name,
+                concept_path=str(note_path),
+                source_book=book.metadata.title,
+            )
+            for concept, note_path in zip(concepts, note_paths)
+        ])
+        tracker.add_processed_record(record)
 
-    # Move processed file
-    processed_path = settings.processed_dir / file_path.name
-    shutil.move(str(file_path), str(processed_path))
+    # Move processed file; a plain rename unless processed/ is on another device
+    processed_path = settings.processed_dir / name
+    try:
+        os.replace(file_path, processed_path)
+    except OSError:
+        shutil.move(str(file_path), str(processed_path))
     console.print(f"[dim]Moved to: {processed_path}[/dim]")
 
     # Send email notification
     if not skip_email:
+        progress.update(task, description=f"{name}: Sending notification...")
+        if not await send_notification(
+            book, concepts, actions, asana_urls, client=email_client,
+        ):
+            console.print(f"[yellow]Email skipped for {name} (not configured)[/yellow]")
+
+    progress.update(task, description=f"[green]✓ {name}[/green]")
+    return record
+
+
+async def _process_books(
+    files: list[Path],
+    settings: Settings,
+    template_cache: Optional[SemanticTemplateCache] = None,
+    dry_run: bool = False,
+    skip_email: bool = False,
+    skip_asana: bool = False,
+) -> list[ProcessedRecord]:
+    """Process several Kindle exports concurrently.
+
+    Every export is parsed and routed up front so that concept and action
+    extraction can be batched across books, sending the profile and
+    instructions once per request rather than once per book. The remaining
+    per-book stages are dominated by LLM, Asana and SMTP round-trips, so up
+    to ``max_concurrency`` books are kept in flight at once.
+
+    Args:
+        files: HTML files to process.
+        settings: Application settings.
+        template_cache: Semantic cache of filled templates, if enabled.
+        dry_run: If True, preview without writing.
+        skip_email: Skip email notifications.
+        skip_asana: Skip Asana task creation.
+
+    Returns:
+        Records for the books that were processed successfully.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from tsc.integrations.asana_client import reset_client as reset_asana_client
+    from tsc.integrations.email_client import EmailClient
+    from tsc.integrations.llm_client import aclose_llm_client
+    from tsc.integrations.semantic_search import get_semantic_search
+    from tsc.memory import MemoryTracker
+    from tsc.parsers import parse_kindle_html
+    from tsc.processors import route_highlights
+    from tsc.processors.action_extractor import extract_actions_batch
+    from tsc.processors.concept_extractor import extract_concepts_batch
+
+    console = _get_console()
+    tracker = MemoryTracker()
+
+    # Parse and route every pending export
+    pending: list[tuple[Path, ParsedBook, RoutedHighlights]] = []
+    for file_path in files:
+        if tracker.is_processed(file_path.name):
+            console.print(f"[yellow]Skipping (already processed): {file_path.name}[/yellow]")
+            continue
+        try:
+            book = parse_kindle_html(file_path)
+        except Exception as e:
+            console.print(f"[red]Error parsing {file_path.name}: {e}[/red]")
+            continue
+        _print_highlight_counts(file_path, book.highlight_counts())
+        pending.append((file_path, book, route_highlights(book)))
+
+    if not pending:
+        return []
+
+    if not dry_run:
+        settings.processed_dir.mkdir(parents=True, exist_ok=True)
+
+    profile = _load_profile(settings)
+    search = get_semantic_search()
+    semaphore = asyncio.Semaphore(settings.max_concurrency)
+
+    # Reuse one SMTP connection for every notification in this run
+    email_client: Optional[EmailClient] = None
+    if not (dry_run or skip_email):
+        try:
+            email_client = EmailClient()
+            email_client.start_session()
+        except ValueError:
+            pass  # Reported per book by send_notification
+
+    try:
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
         ) as progress:
-            task = progress.add_task("Sending notification...", total=None)
-            success = await send_notification(book, concepts, actions, asana_urls)
-            if success:
-                progress.update(task, description="✓ Email sent")
-            else:
-                progress.update(task, description="[yellow]Email skipped (not configured)[/yellow]")
+            # Batch concept and action extraction across all books
+            task = progress.add_task("Extracting concepts and actions...", total=None)
+            concepts_by_book: list[Optional[list[ExtractedConcept]]] = [None] * len(pending)
+            actions_by_book: list[Optional[list[ExtractedAction]]] = [None] * len(pending)
+            try:
+                concepts_by_book, actions_by_book = await asyncio.gather(
+                    extract_concepts_batch(
+                        [(routed.concepts, book.metadata) for _, book, routed in pending],
+                        profile,
+                    ),
+                    extract_actions_batch(
+                        [(routed.actions, book.metadata) for _, book, routed in pending],
+                        profile,
+                    ),
+                )
+            except Exception as e:
+                # Fall back to extracting per book so one bad response
+                # doesn't fail every book in the run
+                console.print(
+                    f"[yellow]Batched extraction failed, extracting per book: {e}[/yellow]"
+                )
+            progress.remove_task(task)
+
+            async def _run(
+                file_path: Path,
+                book: ParsedBook,
+                routed: RoutedHighlights,
+                concepts: Optional[list[ExtractedConcept]],
+                actions: Optional[list[ExtractedAction]],
+            ) -> Optional[ProcessedRecord]:
+                task = progress.add_task(f"[dim]{file_path.name}: queued[/dim]", total=None)
+                async with semaphore:
+                    try:
+                        return await _process_single_book(
+                            file_path,
+                            settings,
+                            book,
+                            routed,
+                            tracker,
+                            search,
+                            profile,
+                            progress,
+                            task,
+                            concepts=concepts,
+                            actions=actions,
+                            template_cache=template_cache,
+                            email_client=email_client,
+                            dry_run=dry_run,
+                            skip_email=skip_email,
+                            skip_asana=skip_asana,
+                        )
+                    except Exception as e:
+                        progress.update(task, description=f"[red]✗ {file_path.name}[/red]")
+                        console.print(f"[red]Error processing {file_path.name}: {e}[/red]")
+                        import traceback
+                        if console.is_terminal:
+                            console.print(traceback.format_exc())
+                        return None
+
+            results = await asyncio.gather(*(
+                _run(file_path, book, routed, concepts, actions)
+                for (file_path, book, routed), concepts, actions
+                in zip(pending, concepts_by_book, actions_by_book)
+            ))
+    finally:
+        if email_client:
+            await email_client.aclose()
+        if not (dry_run or skip_asana):
+            # Release the shared Asana client and its worker pool now
+            # rather than during interpreter shutdown
+            reset_asana_client()
+        # Close pooled API connections while the event loop is still running
+        await aclose_llm_client()
 
-    return record
+    return [r for r in results if r is not None]
 
 
 @click.group()
@@ -297,14 +525,31 @@ def main():
 @click.option("--dry-run", is_flag=True, help="Preview without writing files")
 @click.option("--skip-email", is_flag=True, help="Skip email notification")
 @click.option("--skip-asana", is_flag=True, help="Skip Asana task creation")
+@click.option("--no-cache", is_flag=True, help="Bypass the LLM response cache")
+@click.option("--refresh-cache", is_flag=True,
+              help="Ignore cached LLM responses and store fresh ones")
+@click.option("--semantic-cache-threshold", type=click.FloatRange(0.0, 1.0),
+              default=0.92, show_default=True,
+              help="Similarity above which a similar concept's template is reused")
 def process(
     file_path: Optional[Path],
     dry_run: bool,
     skip_email: bool,
     skip_asana: bool,
+    no_cache: bool,
+    refresh_cache: bool,
+    semantic_cache_threshold: float,
 ):
     """Process Kindle HTML exports into Obsidian notes."""
+    from rich.panel import Panel
+
+    from tsc.cache import configure_cache
+    from tsc.config import get_settings
+    from tsc.integrations.semantic_search import SemanticTemplateCache
+
+    console = _get_console()
     settings = get_settings()
+    configure_cache(enabled=not no_cache, refresh=refresh_cache)
 
     _print_banner()
 
@@ -312,31 +557,28 @@ def process(
         files = [file_path]
     else:
         # Find all HTML files in Kindle directory
-        files = list(settings.tsc_kindle_dir.glob("*.html"))
+        kindle_dir = settings.tsc_kindle_dir
+        files = list(_iter_html_files(kindle_dir)) if kindle_dir.is_dir() else []
         if not files:
             console.print("[yellow]No HTML files found in Kindle directory[/yellow]")
-            console.print(f"  Looking in: {settings.tsc_kindle_dir}")
+            console.print(f"  Looking in: {kindle_dir}")
             return
 
     console.print(f"Found {len(files)} file(s) to process")
 
-    # Process each file
-    records = []
-    for f in files:
-        try:
-            record = asyncio.run(_process_single_book(
-                f,
-                dry_run=dry_run,
-                skip_email=skip_email,
-                skip_asana=skip_asana,
-            ))
-            if record:
-                records.append(record)
-        except Exception as e:
-            console.print(f"[red]Error processing {f.name}: {e}[/red]")
-            import traceback
-            if console.is_terminal:
-                console.print(traceback.format_exc())
+    # Reuse templates of near-duplicate concepts unless caching is off
+    template_cache = None
+    if not (no_cache or refresh_cache):
+        template_cache = SemanticTemplateCache(threshold=semantic_cache_threshold)
+
+    records = asyncio.run(_process_books(
+        files,
+        settings,
+        template_cache=template_cache,
+        dry_run=dry_run,
+        skip_email=skip_email,
+        skip_asana=skip_asana,
+    ))
 
     # Summary
     if records and not dry_run:
@@ -357,6 +599,12 @@ def process(
 @click.option("--dry-run", is_flag=True, help="Preview email content")
 def digest(digest_type: str, dry_run: bool):
     """Send summary digests and reminders."""
+    from rich.table import Table
+
+    from tsc.integrations.email_client import EmailClient
+    from tsc.memory import MemoryTracker
+
+    console = _get_console()
     tracker = MemoryTracker()
     stats = tracker.get_stats()
 
@@ -446,12 +694,17 @@ def digest(digest_type: str, dry_run: bool):
               help="Output format")
 def dashboard(output_format: str):
     """Show statistics and status dashboard."""
+    from rich.table import Table
+
+    from tsc.memory import MemoryTracker
+
+    console = _get_console()
     tracker = MemoryTracker()
     stats = tracker.get_stats()
 
     if output_format == "json":
-        import json
-        console.print(json.dumps(stats, indent=2))
+        from tsc import jsonio
+        console.print(jsonio.dumps(stats, indent=True).decode("utf-8"))
         return
 
     _print_banner()
@@ -1,5 +1,6 @@
 """Configuration loader for The Silent Cartographer."""
 
+import functools
 from pathlib import Path
 from typing import Optional
 
@@ -7,6 +8,10 @@ from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+# Project root, where config.env and state files live
+_PROJECT_ROOT = Path(__file__).parent.parent
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -39,6 +44,29 @@ class Settings(BaseSettings):
         default="cli",
         description="LLM mode: 'cli' (use claude command) or 'api' (use Anthropic API)",
     )
+    llm_concurrency: int = Field(
+        default=5,
+        ge=1,
+        description="Maximum number of LLM requests in flight at once",
+    )
+
+    # LLM response cache
+    tsc_llm_cache: bool = Field(
+        default=True,
+        description="Cache LLM results on disk; set to 0 to disable",
+    )
+    llm_cache_ttl_days: int = Field(
+        default=30,
+        ge=0,
+        description="Days before a cached LLM result expires (0 = never)",
+    )
+
+    # Processing
+    max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum number of books processed concurrently",
+    )
 
     # Anthropic API
     anthropic_api_key: str = Field(
@@ -100,16 +128,41 @@ class Settings(BaseSettings):
     @property
     def memory_file(self) -> Path:
         """Path to memory tracking file."""
-        return Path(__file__).parent.parent / ".memory.json"
+        return _PROJECT_ROOT / ".memory.json"
+
+    @property
+    def llm_cache_dir(self) -> Path:
+        """Path to LLM response cache directory."""
+        return _PROJECT_ROOT / ".llm_cache"
+
 
+def _load_settings(env_file: Optional[Path] = None) -> Settings:
+    """Create a settings instance.
 
-# Global settings instance
-_settings: Optional[Settings] = None
+    Args:
+        env_file: Optional path to environment file. If not provided,
+                  looks for config.env in the project root.
 
+    Returns:
+        Settings instance.
+    """
+    if env_file:
+        return Settings(_env_file=env_file)
 
+    # Try to find config.env in project root
+    config_path = _PROJECT_ROOT / "config.env"
+    if config_path.exists():
+        return Settings(_env_file=config_path)
+    return Settings()
+
+
+@functools.lru_cache(maxsize=1)
 def get_settings(env_file: Optional[Path] = None) -> Settings:
     """Get or create settings instance.
 
+    The most recently requested settings are cached; asking for a
+    different environment file reloads them.
+
     Args:
         env_file: Optional path to environment file. If not provided,
                   looks for config.env in the project root.
@@ -117,24 +170,9 @@ def get_settings(env_file: Optional[Path] = None) -> Settings:
     Returns:
         Settings instance.
     """
-    global _settings
-
-    if _settings is None or env_file is not None:
-        if env_file:
-            _settings = Settings(_env_file=env_file)
-        else:
-            # Try to find config.env in project root
-            project_root = Path(__file__).parent.parent
-            config_path = project_root / "config.env"
-            if config_path.exists():
-                _settings = Settings(_env_file=config_path)
-            else:
-                _settings = Settings()
-
-    return _settings
+    return _load_settings(env_file)
 
 
 def reset_settings() -> None:
     """Reset settings instance (useful for testing)."""
-    global _settings
-    _settings = None
+    get_settings.cache_clear()
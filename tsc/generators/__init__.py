@@ -2,10 +2,11 @@
 
 from tsc.generators.book_note import generate_book_note
 from tsc.generators.concept_note import generate_concept_note
-from tsc.generators.template_filler import fill_template
+from tsc.generators.template_filler import fill_template, fill_templates
 
 __all__ = [
     "generate_book_note",
     "generate_concept_note",
     "fill_template",
+    "fill_templates",
 ]
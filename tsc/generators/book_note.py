@@ -1,32 +1,54 @@
 """Generate book notes with all sections."""
 
+import re
 from datetime import date
 from pathlib import Path
 from typing import Optional
 
-from tsc.parsers.models import Highlight, BookMetadata, ParsedBook
+from tsc.parsers.models import BookMetadata, ParsedBook
 from tsc.processors.concept_extractor import ExtractedConcept
+from tsc.generators.files import write_note
 from tsc.processors.action_extractor import ExtractedAction
 
 
-def _format_quote(highlight: Highlight) -> str:
-    """Format a highlight as a blockquote."""
-    location = highlight.location_str()
-    return f'> "{highlight.text}"\n> — *{location}*'
+# Characters not allowed in note filenames (Unicode letters and digits are kept)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w \-]")
 
 
-def _format_concept_link(concept: ExtractedConcept) -> str:
-    """Format concept as Obsidian link with relevance."""
-    return f"- [[{concept.name}]] (relevance: {concept.relevance_score:.0%})"
+# Book note layout; sections are pre-rendered and empty when not present
+_BOOK_NOTE_FMT = """---
+title: "{title}"
+author: "{author}"
+processed: {today}
+source_file: "{source_file}"
+highlights:
+  yellow: {counts[yellow]}
+  pink: {counts[pink]}
+  blue: {counts[blue]}
+  orange: {counts[orange]}
+tags:
+  - book
+  - processed
+---
 
+# {title}
 
-def _format_action_item(
-    action: ExtractedAction,
-    asana_url: Optional[str] = None,
-) -> str:
-    """Format action as task with optional Asana link."""
-    link_part = f" — [Asana]({asana_url})" if asana_url else ""
-    return f"- [ ] {action.title}{link_part}"
+**Author:** {author}
+**Processed:** {today}
+**Highlights:** {total} total ({counts[yellow]} concepts, {counts[pink]} actions, {counts[blue]} quotes, {counts[orange]} disagreements)
+
+---
+
+{concepts_section}
+{actions_section}
+{quotes_section}
+{disagreements_section}
+---
+
+## Reading Notes
+
+*Add any additional thoughts, connections, or reflections here.*
+"""
 
 
 def generate_book_note(
@@ -34,6 +56,7 @@ def generate_book_note(
     concepts: list[ExtractedConcept],
     actions: list[ExtractedAction],
     asana_urls: Optional[dict[str, str]] = None,
+    counts: Optional[dict[str, int]] = None,
 ) -> str:
     """Generate complete book note.
 
@@ -42,92 +65,63 @@ def generate_book_note(
         concepts: Extracted concepts (from yellow highlights).
         actions: Extracted actions (from pink highlights).
         asana_urls: Optional mapping of action titles to Asana task URLs.
+        counts: Highlight counts by color, if already computed.
 
     Returns:
         Complete markdown content for the book note.
     """
-    today = date.today().isoformat()
     metadata = book.metadata
-    counts = book.highlight_counts()
+    counts = counts or book.highlight_counts()
     asana_urls = asana_urls or {}
+    quotes = book.blue_highlights
+    disagreements = book.orange_highlights
 
     # Build key concepts section
     concepts_section = ""
     if concepts:
-        concepts_list = "\n".join(_format_concept_link(c) for c in concepts)
-        concepts_section = f"""## Key Concepts
-
-{concepts_list}
-"""
+        concepts_section = "## Key Concepts\n\n" + "\n".join([
+            f"- [[{c.name}]] (relevance: {c.relevance_score:.0%})"
+            for c in concepts
+        ]) + "\n"
 
-    # Build action items section
+    # Build action items section, with optional Asana links
     actions_section = ""
     if actions:
-        actions_list = "\n".join(
-            _format_action_item(a, asana_urls.get(a.title))
+        actions_section = "## Action Items\n\n" + "\n".join([
+            f"- [ ] {a.title} — [Asana]({asana_urls[a.title]})"
+            if asana_urls.get(a.title) else f"- [ ] {a.title}"
             for a in actions
-        )
-        actions_section = f"""## Action Items
-
-{actions_list}
-"""
+        ]) + "\n"
 
     # Build beautiful quotes section
     quotes_section = ""
-    if book.blue_highlights:
-        quotes = "\n\n".join(_format_quote(h) for h in book.blue_highlights)
-        quotes_section = f"""## Beautiful Quotes
-
-{quotes}
-"""
+    if quotes:
+        quotes_section = "## Beautiful Quotes\n\n" + "\n\n".join([
+            f'> "{h.text}"\n> — *{h.location_str()}*'
+            for h in quotes
+        ]) + "\n"
 
     # Build disagreements section
     disagreements_section = ""
-    if book.orange_highlights:
-        disagreements = "\n\n".join(
-            _format_quote(h) + "\n\n*My thoughts:* [Add your response here]"
-            for h in book.orange_highlights
-        )
-        disagreements_section = f"""## Disagreements
-
-{disagreements}
-"""
-
-    # Build complete note
-    content = f"""---
-title: "{metadata.title}"
-author: "{metadata.author}"
-processed: {today}
-source_file: "{metadata.source_file.name}"
-highlights:
-  yellow: {counts['yellow']}
-  pink: {counts['pink']}
-  blue: {counts['blue']}
-  orange: {counts['orange']}
-tags:
-  - book
-  - processed
----
-
-# {metadata.title}
-
-**Author:** {metadata.author}
-**Processed:** {today}
-**Highlights:** {sum(counts.values())} total ({counts['yellow']} concepts, {counts['pink']} actions, {counts['blue']} quotes, {counts['orange']} disagreements)
-
----
-
-{concepts_section}
-{actions_section}
-{quotes_section}
-{disagreements_section}
----
-
-## Reading Notes
-
-*Add any additional thoughts, connections, or reflections here.*
-"""
-    return content
+    if disagreements:
+        disagreements_section = "## Disagreements\n\n" + "\n\n".join([
+            f'> "{h.text}"\n> — *{h.location_str()}*'
+            "\n\n*My thoughts:* [Add your response here]"
+            for h in disagreements
+        ]) + "\n"
+
+    return _BOOK_NOTE_FMT.format_map({
+        "title": metadata.title,
+        "author": metadata.author,
+        "today": date.today().isoformat(),
+        "source_file": metadata.source_file.name,
+        "counts": counts,
+        "total": sum(counts.values()),
+        "concepts_section": concepts_section,
+        "actions_section": actions_section,
+        "quotes_section": quotes_section,
+        "disagreements_section": disagreements_section,
+    })
 
 
 def write_book_note(
@@ -136,6 +130,7 @@ def write_book_note(
     actions: list[ExtractedAction],
     output_dir: Path,
     asana_urls: Optional[dict[str, str]] = None,
+    counts: Optional[dict[str, int]] = None,
 ) -> Path:
     """Write book note to file.
 
@@ -145,20 +140,18 @@ def write_book_note(
         actions: Extracted actions.
         output_dir: Directory to write the note to.
         asana_urls: Optional mapping of action titles to Asana task URLs.
+        counts: Highlight counts by color, if already computed.
 
     Returns:
         Path to the created file.
     """
-    content = generate_book_note(book, concepts, actions, asana_urls)
+    content = generate_book_note(book, concepts, actions, asana_urls, counts)
 
     # Sanitize filename
-    safe_title = "".join(
-        c if c.isalnum() or c in " -_" else "_"
-        for c in book.metadata.title
-    ).strip()
+    safe_title = _UNSAFE_FILENAME_CHARS.sub("_", book.metadata.title).strip() or "untitled"
     filename = f"{safe_title}.md"
 
     output_path = output_dir / filename
-    output_path.write_text(content, encoding="utf-8")
+    write_note(output_path, content)
 
     return output_path
@@ -1,71 +1,36 @@
 """Generate concept notes from extracted concepts and filled templates."""
 
+import re
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from tsc.parsers.models import BookMetadata, Highlight
 from tsc.processors.concept_extractor import ExtractedConcept
+from tsc.generators.files import write_note
 from tsc.generators.template_filler import FilledTemplate
 
 
-def _format_wikilinks(items: list[str]) -> str:
-    """Format a list of items as Obsidian wikilinks."""
-    return ", ".join(f"[[{item}]]" for item in items) if items else "None yet"
-
-
-def _format_questions(questions: list[str]) -> str:
-    """Format questions as a bulleted list."""
-    return "\n".join(f"- {q}" for q in questions) if questions else "- None yet"
-
-
-def _format_highlights(highlights: list[Highlight]) -> str:
-    """Format supporting highlights as blockquotes."""
-    if not highlights:
-        return "> No highlights captured"
-
-    formatted = []
-    for h in highlights:
-        location = h.location_str() if hasattr(h, 'location_str') else ""
-        formatted.append(f"> \"{h.text}\"\n> — {location}")
-
-    return "\n\n".join(formatted)
-
-
-def generate_concept_note(
-    concept: ExtractedConcept,
-    filled: FilledTemplate,
-    metadata: BookMetadata,
-    supporting_highlights: Optional[list[Highlight]] = None,
-) -> str:
-    """Generate a complete concept note from template.
+# Characters not allowed in note filenames (Unicode letters and digits are kept)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w \-]")
 
-    Args:
-        concept: The extracted concept.
-        filled: The filled template sections.
-        metadata: Source book metadata.
-        supporting_highlights: Original highlights that support this concept.
-
-    Returns:
-        Complete markdown content for the concept note.
-    """
-    today = date.today().isoformat()
-    highlights_section = _format_highlights(supporting_highlights or [])
 
-    content = f"""---
-title: "{concept.name}"
-source: "[[{metadata.title}]]"
-author: "{metadata.author}"
+# Concept note layout; list fields are pre-rendered
+_CONCEPT_NOTE_FMT = """---
+title: "{name}"
+source: "[[{source}]]"
+author: "{author}"
 created: {today}
-relevance: {concept.relevance_score:.2f}
+relevance: {relevance:.2f}
 tags:
   - concept
   - from-reading
 ---
 
-# {concept.name}
+# {name}
 
-> {concept.description}
+> {description}
 
 ---
 
@@ -130,8 +95,8 @@ tags:
 ## 🔗 Connections
 *(Situate this idea in your graph.)*
 
-- **Related Concepts:** {_format_wikilinks(filled.connections_supportive)}
-- **Contrasting Ideas:** {_format_wikilinks(filled.connections_contrasting)}
+- **Related Concepts:** {related_concepts}
+- **Contrasting Ideas:** {contrasting_ideas}
 - **Source:** {filled.connections_sources}
 
 ---
@@ -148,9 +113,68 @@ tags:
 ## ❓ Open Questions
 *(Hooks for future learning.)*
 
-{_format_questions(filled.open_questions)}
+{open_questions}
 """
-    return content
+
+
+@lru_cache(maxsize=4096)
+def _format_wikilinks(items: tuple[str, ...]) -> str:
+    """Format a list of items as Obsidian wikilinks."""
+    return ", ".join(f"[[{item}]]" for item in items) if items else "None yet"
+
+
+@lru_cache(maxsize=4096)
+def _format_questions(questions: tuple[str, ...]) -> str:
+    """Format questions as a bulleted list."""
+    return "\n".join(f"- {q}" for q in questions) if questions else "- None yet"
+
+
+@lru_cache(maxsize=1024)
+def _safe_name(name: str) -> str:
+    """Turn a concept name into a safe note filename stem."""
+    return _UNSAFE_FILENAME_CHARS.sub("_", name).strip() or "untitled"
+
+
+def _format_highlights(highlights: list[Highlight]) -> str:
+    """Format supporting highlights as blockquotes."""
+    if not highlights:
+        return "> No highlights captured"
+
+    return "\n\n".join(
+        f"> \"{h.text}\"\n> — {h.location_str()}" for h in highlights
+    )
+
+
+def generate_concept_note(
+    concept: ExtractedConcept,
+    filled: FilledTemplate,
+    metadata: BookMetadata,
+    supporting_highlights: Optional[list[Highlight]] = None,
+) -> str:
+    """Generate a complete concept note from template.
+
+    Args:
+        concept: The extracted concept.
+        filled: The filled template sections.
+        metadata: Source book metadata.
+        supporting_highlights: Original highlights that support this concept.
+
+    Returns:
+        Complete markdown content for the concept note.
+    """
+    return _CONCEPT_NOTE_FMT.format_map({
+        "name": concept.name,
+        "description": concept.description,
+        "source": metadata.title,
+        "author": metadata.author,
+        "today": date.today().isoformat(),
+        "relevance": concept.relevance_score,
+        "highlights_section": _format_highlights(supporting_highlights or []),
+        "filled": filled,
+        "related_concepts": _format_wikilinks(tuple(filled.connections_supportive)),
+        "contrasting_ideas": _format_wikilinks(tuple(filled.connections_contrasting)),
+        "open_questions": _format_questions(tuple(filled.open_questions)),
+    })
 
 
 def write_concept_note(
@@ -174,14 +198,9 @@ def write_concept_note(
     """
     content = generate_concept_note(concept, filled, metadata, supporting_highlights)
 
-    # Sanitize filename
-    safe_name = "".join(
-        c if c.isalnum() or c in " -_" else "_"
-        for c in concept.name
-    ).strip()
-    filename = f"{safe_name}.md"
+    filename = f"{_safe_name(concept.name)}.md"
 
     output_path = output_dir / filename
-    output_path.write_text(content, encoding="utf-8")
+    write_note(output_path, content)
 
     return output_path
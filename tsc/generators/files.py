@@ -0,0 +1,35 @@
+"""File helpers shared by the note generators."""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_note(path: Path, content: str) -> None:
+    """Atomically write a note as UTF-8.
+
+    The encoded content is written to a temporary file in the same
+    directory with a single write call where the OS allows it, then swapped
+    into place so Obsidian never sees a partially written note.
+
+    Args:
+        path: Destination file path.
+        content: Note content.
+    """
+    data = memoryview(content.encode("utf-8"))
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent,
+        prefix=f".{path.stem}.",
+        suffix=".tmp",
+    )
+    try:
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -1,15 +1,24 @@
 """Fill concept note template sections using LLM."""
 
-import json
+import asyncio
+import re
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
+from tsc import jsonio
+from tsc.cache import disk_cache
 from tsc.parsers.models import Highlight, BookMetadata
 from tsc.processors.concept_extractor import ExtractedConcept
 from tsc.integrations.llm_client import query_llm
 
 
+# Bump when the prompts below change so cached responses are not reused
+PROMPT_VERSION = 1
+
+
 class FilledTemplate(BaseModel):
     """A fully filled concept template."""
 
@@ -45,6 +54,39 @@ class FilledTemplate(BaseModel):
     open_questions: list[str] = Field(default_factory=list, description="Questions for further exploration")
 
 
+# JSON structure of a filled template, shared by the single and batch prompts
+_TEMPLATE_FIELDS = """    "trivium_grammar": "Core idea explained simply, as if to a child",
+    "trivium_logic": "Cause-effect mechanism or principle behind it",
+    "trivium_rhetoric": "Analogy, metaphor, or pitch line for explaining to others",
+
+    "dialectic_thesis": "The core idea restated",
+    "dialectic_antithesis": "Strongest opposing view or limitation",
+    "dialectic_synthesis": "New perspective from holding both together",
+
+    "polarity_tension": "The ongoing tension this idea sits inside (e.g., freedom vs discipline)",
+    "polarity_balance": "How both sides can be balanced rather than solved",
+
+    "socratic_falsification": "What would prove this idea wrong or incomplete",
+
+    "scientific_hypothesis": "If I apply this, what result do I expect?",
+    "scientific_experiment": "One small way to test it",
+    "scientific_measure": "How to know if it worked",
+    "scientific_learn": "What to refine or change based on results",
+
+    "kairos_relevant": "When and under what conditions this is most relevant",
+    "kairos_irrelevant": "Conditions under which it loses relevance",
+
+    "connections_supportive": ["Existing Note 1", "Existing Note 2"],
+    "connections_contrasting": ["Contrasting Note"],
+    "connections_sources": "Book citation with strongest supporting quote",
+
+    "applications_work": "Specific application to Hermes AI or Serranova",
+    "applications_family": "Application to family, marriage, or parenting",
+    "applications_personal": "Application to personal growth, faith, or development",
+
+    "open_questions": ["Question 1 for further exploration", "Question 2"]
+"""
+
 TEMPLATE_FILL_PROMPT = """You are a philosophical thinker helping to deeply analyze a concept from a book.
 
 Concept: {concept_name}
@@ -67,42 +109,132 @@ For connections, only link to notes that actually exist in the provided list.
 
 Respond with valid JSON matching this structure:
 {{
-    "trivium_grammar": "Core idea explained simply, as if to a child",
-    "trivium_logic": "Cause-effect mechanism or principle behind it",
-    "trivium_rhetoric": "Analogy, metaphor, or pitch line for explaining to others",
+""" + _TEMPLATE_FIELDS + """}}
 
-    "dialectic_thesis": "The core idea restated",
-    "dialectic_antithesis": "Strongest opposing view or limitation",
-    "dialectic_synthesis": "New perspective from holding both together",
+Be concise but insightful. Each field should be 1-3 sentences max.
+"""
 
-    "polarity_tension": "The ongoing tension this idea sits inside (e.g., freedom vs discipline)",
-    "polarity_balance": "How both sides can be balanced rather than solved",
 
-    "socratic_falsification": "What would prove this idea wrong or incomplete",
+TEMPLATE_BATCH_FILL_PROMPT = """You are a philosophical thinker helping to deeply analyze several concepts from a book.
 
-    "scientific_hypothesis": "If I apply this, what result do I expect?",
-    "scientific_experiment": "One small way to test it",
-    "scientific_measure": "How to know if it worked",
-    "scientific_learn": "What to refine or change based on results",
+Source: "{book_title}" by {book_author}
 
-    "kairos_relevant": "When and under what conditions this is most relevant",
-    "kairos_irrelevant": "Conditions under which it loses relevance",
+User Profile (for personalizing applications):
+{profile}
 
-    "connections_supportive": ["Existing Note 1", "Existing Note 2"],
-    "connections_contrasting": ["Contrasting Note"],
-    "connections_sources": "Book citation with strongest supporting quote",
+Existing Notes in Knowledge Base (for connections):
+{existing_notes}
 
-    "applications_work": "Specific application to Hermes AI or Serranova",
-    "applications_family": "Application to family, marriage, or parenting",
-    "applications_personal": "Application to personal growth, faith, or development",
+Concepts to analyze:
 
-    "open_questions": ["Question 1 for further exploration", "Question 2"]
+{concepts}
+
+For EACH concept above, fill out each section of this concept analysis framework thoughtfully and concisely.
+Be specific and practical. Use the user's profile to make applications relevant.
+For connections, only link to notes that actually exist in the provided list.
+
+Respond with valid JSON in this format, with one result per concept:
+{{
+    "results": [
+        {{"id": 0, ...fields...}}
+    ]
 }}
 
+where "id" is the concept's number and each result has these fields:
+{{
+""" + _TEMPLATE_FIELDS + """}}
+
 Be concise but insightful. Each field should be 1-3 sentences max.
 """
 
+# Concepts sent per batched request, bounded so the response fits in max_tokens
+_CONCEPTS_PER_REQUEST = 5
 
+# One supporting highlight line in a prompt
+_SUPPORTING_LINE = '- "{}" ({})'.format
+
+# JSON object inside a markdown code block, with or without a language tag
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def _format_supporting(concept: ExtractedConcept, highlights: list[Highlight]) -> str:
+    """Format a concept's supporting highlights for the prompt."""
+    n = len(highlights)
+    valid = [i for i in concept.supporting_highlights if 0 <= i < n]
+    if not valid:
+        return ""
+
+    # Gather all supporting highlights in one call; a single index
+    # yields the item itself rather than a tuple
+    supporting = itemgetter(*valid)(highlights)
+    if len(valid) == 1:
+        supporting = (supporting,)
+
+    return "\n".join(_SUPPORTING_LINE(h.text, h.location_str()) for h in supporting)
+
+
+# Most existing note titles listed in a prompt
+_MAX_EXISTING_NOTES = 50
+
+
+@lru_cache(maxsize=64)
+def _format_notes_text(notes: tuple[str, ...]) -> str:
+    """Format note titles as a wikilink list; identical for a book's concepts."""
+    if not notes:
+        return "No existing notes yet."
+    return "\n".join(f"- [[{note}]]" for note in notes)
+
+
+def _format_existing_notes(existing_notes: list[str]) -> str:
+    """Format existing note titles for the prompt."""
+    return _format_notes_text(tuple(existing_notes[:_MAX_EXISTING_NOTES]))
+
+
+def _extract_json(response_text: str) -> str:
+    """Return the JSON document in an LLM response."""
+    # Bare JSON needs no further scanning
+    stripped = response_text.strip()
+    if stripped.startswith("{"):
+        return stripped
+
+    # Extract JSON from a markdown code block
+    match = _JSON_FENCE.search(response_text)
+    return match.group(1) if match else response_text
+
+
+def _template_cache_key(
+    concept: ExtractedConcept,
+    highlights: list[Highlight],
+    metadata: BookMetadata,
+    profile_content: str,
+    existing_notes: list[str],
+) -> tuple:
+    """Identify a filled template by its concept, book and profile.
+
+    The highlight list and existing notes are left out: the former is
+    fixed for a given book and concept, and the latter grows every run,
+    which would otherwise make re-running a book always miss.
+    """
+    return (concept.name, concept.description, metadata.title, metadata.author, profile_content)
+
+
+def _templates_chunk_cache_key(
+    concepts: list[ExtractedConcept],
+    highlights: list[Highlight],
+    metadata: BookMetadata,
+    profile_content: str,
+    existing_notes: list[str],
+) -> tuple:
+    """Identify a batch of filled templates; see _template_cache_key."""
+    return (
+        [(c.name, c.description) for c in concepts],
+        metadata.title,
+        metadata.author,
+        profile_content,
+    )
+
+
+@disk_cache("templates", version=PROMPT_VERSION, key=_template_cache_key)
 async def fill_template(
     concept: ExtractedConcept,
     highlights: list[Highlight],
@@ -122,40 +254,131 @@ async def fill_template(
     Returns:
         FilledTemplate with all sections populated.
     """
-    # Get supporting highlights
-    supporting = [
-        highlights[i] for i in concept.supporting_highlights
-        if i < len(highlights)
-    ]
-    supporting_text = "\n".join(
-        f"- \"{h.text}\" ({h.location_str()})"
-        for h in supporting
-    )
-
-    # Format existing notes
-    notes_text = "\n".join(f"- [[{note}]]" for note in existing_notes[:50]) if existing_notes else "No existing notes yet."
-
     prompt = TEMPLATE_FILL_PROMPT.format(
         concept_name=concept.name,
         concept_description=concept.description,
         book_title=metadata.title,
         book_author=metadata.author,
-        supporting_highlights=supporting_text,
+        supporting_highlights=_format_supporting(concept, highlights),
         profile=profile_content,
-        existing_notes=notes_text,
+        existing_notes=_format_existing_notes(existing_notes),
     )
 
     response_text = await query_llm(prompt, max_tokens=4096)
 
-    # Extract JSON from response
-    if "```json" in response_text:
-        json_start = response_text.find("```json") + 7
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-    elif "```" in response_text:
-        json_start = response_text.find("```") + 3
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-
-    data = json.loads(response_text)
-    return FilledTemplate(**data)
+    # Parse and validate in one pass, without an intermediate dict
+    return FilledTemplate.model_validate_json(_extract_json(response_text))
+
+
+def _any_filled(results: list[Optional[FilledTemplate]]) -> bool:
+    """Whether a batch filled anything worth caching."""
+    return any(filled is not None for filled in results)
+
+
+@disk_cache(
+    "templates_batch",
+    version=PROMPT_VERSION,
+    key=_templates_chunk_cache_key,
+    cache_if=_any_filled,
+)
+async def _fill_templates_chunk(
+    concepts: list[ExtractedConcept],
+    highlights: list[Highlight],
+    metadata: BookMetadata,
+    profile_content: str,
+    existing_notes: list[str],
+) -> list[Optional[FilledTemplate]]:
+    """Fill templates for a chunk of concepts with a single LLM request.
+
+    Concepts missing from the response are returned as None.
+    """
+    concepts_text = "\n\n".join(
+        f"Concept {concept_id}: {concept.name}\n"
+        f"Description: {concept.description}\n"
+        f"Supporting Highlights:\n{_format_supporting(concept, highlights)}"
+        for concept_id, concept in enumerate(concepts)
+    )
+
+    prompt = TEMPLATE_BATCH_FILL_PROMPT.format(
+        book_title=metadata.title,
+        book_author=metadata.author,
+        profile=profile_content,
+        existing_notes=_format_existing_notes(existing_notes),
+        concepts=concepts_text,
+    )
+
+    response_text = await query_llm(prompt, max_tokens=4096 * len(concepts))
+
+    # Match the tagged results back to their concepts; malformed results
+    # are left as None for fill_templates to fill individually
+    results: list[Optional[FilledTemplate]] = [None] * len(concepts)
+    try:
+        data = jsonio.loads(_extract_json(response_text))
+    except ValueError:
+        # Truncated or invalid response
+        return results
+    tagged = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(tagged, list):
+        return results
+    for r in tagged:
+        if not isinstance(r, dict):
+            continue
+        concept_id = r.pop("id", None)
+        if isinstance(concept_id, int) and 0 <= concept_id < len(concepts):
+            try:
+                results[concept_id] = FilledTemplate.model_validate(r)
+            except ValidationError:
+                pass
+
+    return results
+
+
+async def fill_templates(
+    concepts: list[ExtractedConcept],
+    highlights: list[Highlight],
+    metadata: BookMetadata,
+    profile_content: str,
+    existing_notes: list[str],
+) -> list[FilledTemplate]:
+    """Fill templates for several concepts in as few LLM requests as possible.
+
+    The book, profile and existing notes are sent once per request instead
+    of once per concept; concepts are grouped into requests of a few
+    concepts each. Any concept the model skips is filled on its own.
+
+    Args:
+        concepts: The extracted concepts to analyze.
+        highlights: All yellow highlights from the book.
+        metadata: Book metadata for citation.
+        profile_content: User profile for personalizing applications.
+        existing_notes: List of existing note titles for connections.
+
+    Returns:
+        FilledTemplate for each input concept, in input order.
+    """
+    if len(concepts) <= 1:
+        return [
+            await fill_template(concept, highlights, metadata, profile_content, existing_notes)
+            for concept in concepts
+        ]
+
+    chunks = [
+        concepts[i:i + _CONCEPTS_PER_REQUEST]
+        for i in range(0, len(concepts), _CONCEPTS_PER_REQUEST)
+    ]
+    chunk_results = await asyncio.gather(*(
+        _fill_templates_chunk(chunk, highlights, metadata, profile_content, existing_notes)
+        for chunk in chunks
+    ))
+    results = [filled for filled_chunk in chunk_results for filled in filled_chunk]
+
+    # Fill anything the batched responses left out individually
+    missing = [i for i, filled in enumerate(results) if filled is None]
+    fallback = await asyncio.gather(*(
+        fill_template(concepts[i], highlights, metadata, profile_content, existing_notes)
+        for i in missing
+    ))
+    for i, filled in zip(missing, fallback):
+        results[i] = filled
+
+    return results
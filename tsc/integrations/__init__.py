@@ -1,36 +1,45 @@
 """External service integrations.
 
-Imports are done lazily to avoid circular imports.
+Imports are done lazily to avoid circular imports: each name is imported
+from its module on first access and then bound on this package, so later
+lookups cost nothing extra.
 """
 
+import importlib
 
-def get_anthropic_client():
-    """Get Anthropic client."""
-    from tsc.integrations.anthropic_client import get_anthropic_client as _get
-    return _get()
 
+# Public name -> module that defines it
+_LAZY_ATTRS = {
+    "get_anthropic_client": "tsc.integrations.anthropic_client",
+    "create_task": "tsc.integrations.asana_client",
+    "create_tasks": "tsc.integrations.asana_client",
+    "send_notification": "tsc.integrations.email_client",
+    "find_related_notes": "tsc.integrations.semantic_search",
+    "get_semantic_search": "tsc.integrations.semantic_search",
+}
 
-def create_task(*args, **kwargs):
-    """Create Asana task."""
-    from tsc.integrations.asana_client import create_task as _create
-    return _create(*args, **kwargs)
 
+def __getattr__(name: str):
+    """Import a lazily exported name on first access (PEP 562)."""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def send_notification(*args, **kwargs):
-    """Send email notification."""
-    from tsc.integrations.email_client import send_notification as _send
-    return _send(*args, **kwargs)
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
 
-def find_related_notes(*args, **kwargs):
-    """Find related notes."""
-    from tsc.integrations.semantic_search import find_related_notes as _find
-    return _find(*args, **kwargs)
+def __dir__() -> list[str]:
+    """Include lazily exported names in dir()."""
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 
 __all__ = [
     "get_anthropic_client",
     "create_task",
+    "create_tasks",
     "send_notification",
     "find_related_notes",
+    "get_semantic_search",
 ]
@@ -33,6 +33,15 @@ def get_anthropic_client() -> anthropic.AsyncAnthropic:
     return _client
 
 
+async def aclose_client() -> None:
+    """Close the client's connection pool and reset the instance."""
+    global _client
+
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
 def reset_client() -> None:
     """Reset client instance (useful for testing)."""
     global _client
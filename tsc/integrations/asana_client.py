@@ -1,5 +1,7 @@
 """Asana integration for task creation."""
 
+import asyncio
+import threading
 from typing import Optional
 
 import asana
@@ -10,6 +12,33 @@ from tsc.processors.action_extractor import ExtractedAction
 from tsc.parsers.models import BookMetadata
 
 
+# Concurrent task creation requests, well under Asana's 150 requests/minute
+MAX_CONCURRENT_REQUESTS = 8
+
+# Most actions Asana's batch API accepts in one request
+BATCH_SIZE = 10
+
+# Fields returned for created tasks
+_TASK_FIELDS = ["gid", "permalink_url", "name"]
+
+# Limits concurrent Asana requests across all books, created for the
+# running event loop
+_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Get the request semaphore for the running event loop."""
+    global _semaphore, _semaphore_loop
+
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        _semaphore_loop = loop
+
+    return _semaphore
+
+
 class AsanaClient:
     """Client for Asana API operations."""
 
@@ -27,6 +56,7 @@ class AsanaClient:
         configuration.access_token = settings.asana_access_token
         self.api_client = asana.ApiClient(configuration)
         self.tasks_api = asana.TasksApi(self.api_client)
+        self.batch_api = asana.BatchAPIApi(self.api_client)
         self.workspace_gid = settings.asana_workspace_gid
         self.project_gid = settings.asana_project_gid
 
@@ -49,6 +79,64 @@ class AsanaClient:
         Raises:
             ApiException: If Asana API call fails.
         """
+        task_data = {"data": self._task_data(action, metadata, highlight_text)}
+
+        # Create the task
+        opts = {"opt_fields": ",".join(_TASK_FIELDS)}
+        result = self.tasks_api.create_task(task_data, opts)
+
+        return result
+
+    def create_tasks_batch(
+        self,
+        actions: list[tuple[ExtractedAction, str]],
+        metadata: BookMetadata,
+    ) -> list[Optional[dict]]:
+        """Create up to BATCH_SIZE tasks with a single batch API request.
+
+        Args:
+            actions: (action, original highlight text) pairs.
+            metadata: Book metadata for context.
+
+        Returns:
+            Task data for each action, or None where Asana rejected it,
+            in input order.
+
+        Raises:
+            ApiException: If the batch request itself fails.
+        """
+        body = {
+            "data": {
+                "actions": [
+                    {
+                        "relative_path": "/tasks",
+                        "method": "post",
+                        "data": self._task_data(action, metadata, highlight_text),
+                        "options": {"fields": _TASK_FIELDS},
+                    }
+                    for action, highlight_text in actions
+                ]
+            }
+        }
+        responses = self.batch_api.create_batch_request(body, {})
+
+        results: list[Optional[dict]] = []
+        for (action, _), response in zip(actions, responses):
+            if 200 <= response.get("status_code", 0) < 300:
+                results.append(response["body"]["data"])
+            else:
+                print(f"Warning: Failed to create Asana task '{action.title}': {response.get('body')}")
+                results.append(None)
+
+        return results
+
+    def _task_data(
+        self,
+        action: ExtractedAction,
+        metadata: BookMetadata,
+        highlight_text: str,
+    ) -> dict:
+        """Build the request data for a new task."""
         # Build task description with context
         notes = f"""📖 From: "{metadata.title}" by {metadata.author}
 
@@ -62,23 +150,27 @@ class AsanaClient:
 *Created by The Silent Cartographer*
 """
 
-        task_data = {
-            "data": {
-                "name": action.title,
-                "notes": notes,
-                "workspace": self.workspace_gid,
-            }
+        data = {
+            "name": action.title,
+            "notes": notes,
+            "workspace": self.workspace_gid,
         }
 
         # Add to project if configured
         if self.project_gid:
-            task_data["data"]["projects"] = [self.project_gid]
+            data["projects"] = [self.project_gid]
 
-        # Create the task
-        opts = {"opt_fields": "gid,permalink_url,name"}
-        result = self.tasks_api.create_task(task_data, opts)
+        return data
 
-        return result
+    def close(self) -> None:
+        """Close the API client's HTTP connections and worker thread pool."""
+        self.api_client.rest_client.pool_manager.clear()
+        pool = getattr(self.api_client, "pool", None)
+        if pool is not None:
+            pool.close()
+            pool.join()
+            # The SDK's finalizer closes the pool again if it is still set
+            del self.api_client.pool
 
     def get_task_url(self, task_gid: str) -> str:
         """Get the web URL for a task.
@@ -92,6 +184,40 @@ class AsanaClient:
         return f"https://app.asana.com/0/{self.project_gid}/{task_gid}"
 
 
+_client: Optional[AsanaClient] = None
+_client_lock = threading.Lock()
+
+
+def get_asana_client() -> AsanaClient:
+    """Get or create the shared Asana client.
+
+    Safe to call from worker threads; the client is built at most once.
+
+    Returns:
+        AsanaClient instance.
+
+    Raises:
+        ValueError: If the access token is not configured.
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AsanaClient()
+
+    return _client
+
+
+def reset_client() -> None:
+    """Close and drop the shared client, if one was created."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
 async def create_task(
     action: ExtractedAction,
     metadata: BookMetadata,
@@ -107,11 +233,55 @@ async def create_task(
     Returns:
         URL to the created task, or None if creation fails.
     """
+    urls = await create_tasks([(action, highlight_text)], metadata)
+    return urls[0]
+
+
+async def create_tasks(
+    actions: list[tuple[ExtractedAction, str]],
+    metadata: BookMetadata,
+) -> list[Optional[str]]:
+    """Create several Asana tasks using the batch API.
+
+    Actions are sent BATCH_SIZE per request, with the requests themselves
+    made concurrently; at most MAX_CONCURRENT_REQUESTS are in flight at
+    once across all callers.
+
+    Args:
+        actions: (action, original highlight text) pairs.
+        metadata: Book metadata for context.
+
+    Returns:
+        URL of each created task, or None where creation failed, in input order.
+    """
+    if not actions:
+        return []
+
     try:
-        client = AsanaClient()
-        result = client.create_task(action, metadata, highlight_text)
-        return result.get("permalink_url") or client.get_task_url(result["gid"])
-    except (ValueError, ApiException) as e:
-        # Log error but don't fail the whole process
-        print(f"Warning: Failed to create Asana task: {e}")
-        return None
+        client = get_asana_client()
+    except ValueError as e:
+        print(f"Warning: Failed to create Asana tasks: {e}")
+        return [None] * len(actions)
+
+    semaphore = _get_semaphore()
+
+    async def _create_batch(batch: list[tuple[ExtractedAction, str]]) -> list[Optional[dict]]:
+        async with semaphore:
+            try:
+                # The Asana SDK is blocking, so run it in a worker thread
+                return await asyncio.to_thread(client.create_tasks_batch, batch, metadata)
+            except ApiException as e:
+                # Log error but don't fail the whole process
+                print(f"Warning: Failed to create Asana tasks: {e}")
+                return [None] * len(batch)
+
+    batches = await asyncio.gather(*(
+        _create_batch(actions[i:i + BATCH_SIZE])
+        for i in range(0, len(actions), BATCH_SIZE)
+    ))
+
+    return [
+        (result.get("permalink_url") or client.get_task_url(result["gid"])) if result else None
+        for batch in batches
+        for result in batch
+    ]
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import date
 from typing import TYPE_CHECKING, Any, Optional
 
+import aiosmtplib
+
 from tsc.config import get_settings
 
 if TYPE_CHECKING:
@@ -17,7 +20,13 @@ if TYPE_CHECKING:
 
 
 class EmailClient:
-    """SMTP email client for notifications."""
+    """SMTP email client for notifications.
+
+    ``send_async`` talks SMTP without blocking the event loop. Used as an
+    async context manager, the client keeps one authenticated connection
+    open and reuses it for every message sent inside the block; otherwise
+    each send opens its own connection.
+    """
 
     def __init__(self):
         """Initialize email client with configured credentials."""
@@ -35,17 +44,44 @@ class EmailClient:
         self.password = settings.smtp_password
         self.recipient = settings.tsc_email_to or settings.smtp_user
 
-    def send(self, subject: str, body_html: str, body_text: Optional[str] = None) -> bool:
-        """Send an email.
+        self._in_session = False
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._lock = asyncio.Lock()
 
-        Args:
-            subject: Email subject line.
-            body_html: HTML body content.
-            body_text: Optional plain text body (fallback).
+    async def __aenter__(self) -> "EmailClient":
+        """Start a session for the duration of the block."""
+        self.start_session()
+        return self
 
-        Returns:
-            True if sent successfully, False otherwise.
+    async def __aexit__(self, *exc_info) -> None:
+        """End the session and close its connection."""
+        await self.aclose()
+
+    def start_session(self) -> None:
+        """Reuse one connection for later sends until aclose() is called.
+
+        The connection is opened on the first send.
         """
+        self._in_session = True
+
+    async def aclose(self) -> None:
+        """Close the session's SMTP connection, if one is open."""
+        async with self._lock:
+            self._in_session = False
+            if self._smtp is not None:
+                try:
+                    await self._smtp.quit()
+                except aiosmtplib.SMTPException:
+                    pass
+                self._smtp = None
+
+    def _build_message(
+        self,
+        subject: str,
+        body_html: str,
+        body_text: Optional[str] = None,
+    ) -> MIMEMultipart:
+        """Build a multipart message addressed to the configured recipient."""
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
         msg["From"] = self.user
@@ -58,106 +94,195 @@ class EmailClient:
         # Add HTML version
         msg.attach(MIMEText(body_html, "html"))
 
+        return msg
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open an authenticated SMTP connection."""
+        smtp = aiosmtplib.SMTP(hostname=self.host, port=self.port, start_tls=False)
+        await smtp.connect()
         try:
-            with smtplib.SMTP(self.host, self.port) as server:
-                server.starttls()
-                server.login(self.user, self.password)
-                server.sendmail(self.user, self.recipient, msg.as_string())
+            await smtp.starttls()
+            await smtp.login(self.user, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        return smtp
+
+    async def _send_in_session(self, msg: MIMEMultipart) -> None:
+        """Send over the session connection, reconnecting if it was dropped."""
+        if self._smtp is None or not self._smtp.is_connected:
+            self._smtp = await self._connect()
+        try:
+            await self._smtp.send_message(msg)
+        except aiosmtplib.SMTPServerDisconnected:
+            # Servers close idle connections; retry once on a fresh one
+            self._smtp = await self._connect()
+            await self._smtp.send_message(msg)
+
+    async def send_async(
+        self,
+        subject: str,
+        body_html: str,
+        body_text: Optional[str] = None,
+    ) -> bool:
+        """Send an email without blocking the event loop.
+
+        Args:
+            subject: Email subject line.
+            body_html: HTML body content.
+            body_text: Optional plain text body (fallback).
+
+        Returns:
+            True if sent successfully, False otherwise.
+        """
+        msg = self._build_message(subject, body_html, body_text)
+
+        try:
+            async with self._lock:
+                if self._in_session:
+                    await self._send_in_session(msg)
+                else:
+                    smtp = await self._connect()
+                    try:
+                        await smtp.send_message(msg)
+                    finally:
+                        await smtp.quit()
             return True
         except Exception as e:
             print(f"Warning: Failed to send email: {e}")
             return False
 
+    def send(self, subject: str, body_html: str, body_text: Optional[str] = None) -> bool:
+        """Send an email, blocking until done.
 
-def _build_book_processed_email(
-    book: "ParsedBook",
-    concepts: list[Any],
-    actions: list[Any],
-    asana_urls: dict[str, str],
-) -> tuple[str, str]:
-    """Build email content for a processed book.
-
-    Returns:
-        Tuple of (subject, html_body).
-    """
-    counts = book.highlight_counts()
-    total = sum(counts.values())
+        For one-off sends outside an event loop, e.g. from the digest command.
 
-    subject = f"📚 TSC: Processed \"{book.metadata.title}\""
+        Args:
+            subject: Email subject line.
+            body_html: HTML body content.
+            body_text: Optional plain text body (fallback).
 
-    # Build concepts list
-    concepts_html = ""
-    if concepts:
-        concept_items = "\n".join(
-            f"<li><strong>{c.name}</strong> — {c.description}</li>"
-            for c in concepts
-        )
-        concepts_html = f"""
-        <h3>Key Concepts ({len(concepts)})</h3>
-        <ul>{concept_items}</ul>
+        Returns:
+            True if sent successfully, False otherwise.
         """
+        msg = self._build_message(subject, body_html, body_text)
+
+        try:
+            with smtplib.SMTP(self.host, self.port) as server:
+                server.starttls()
+                server.login(self.user, self.password)
+                server.sendmail(self.user, self.recipient, msg.as_string())
+            return True
+        except Exception as e:
+            print(f"Warning: Failed to send email: {e}")
+            return False
 
-    # Build actions list
-    actions_html = ""
-    if actions:
-        action_items = []
-        for a in actions:
-            url = asana_urls.get(a.title, "")
-            link = f' <a href="{url}">[Asana]</a>' if url else ""
-            action_items.append(f"<li>{a.title}{link}</li>")
-        actions_html = f"""
-        <h3>Action Items ({len(actions)})</h3>
-        <ul>{"".join(action_items)}</ul>
-        """
 
-    html_body = f"""
+# Static parts of the book-processed email, filled per book
+_EMAIL_HEADER_FMT = """
     <html>
     <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">
         <h1 style="color: #2d3748;">📚 Book Processed</h1>
 
         <div style="background: #f7fafc; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
-            <h2 style="margin-top: 0; color: #4a5568;">{book.metadata.title}</h2>
-            <p style="color: #718096; margin-bottom: 0;">by {book.metadata.author}</p>
+            <h2 style="margin-top: 0; color: #4a5568;">{title}</h2>
+            <p style="color: #718096; margin-bottom: 0;">by {author}</p>
         </div>
 
         <div style="margin-bottom: 20px;">
             <h3>Highlight Summary</h3>
             <table style="width: 100%; border-collapse: collapse;">
-                <tr>
-                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0;">🟡 Concepts (Yellow)</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0; text-align: right;"><strong>{counts['yellow']}</strong></td>
-                </tr>
-                <tr>
-                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0;">🩷 Actions (Pink)</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0; text-align: right;"><strong>{counts['pink']}</strong></td>
-                </tr>
-                <tr>
-                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0;">🔵 Quotes (Blue)</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0; text-align: right;"><strong>{counts['blue']}</strong></td>
-                </tr>
-                <tr>
-                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0;">🟠 Disagreements (Orange)</td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0; text-align: right;"><strong>{counts['orange']}</strong></td>
+"""
+
+_EMAIL_ROW_FMT = """                <tr>
+                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0;">{label}</td>
+                    <td style="padding: 8px; border-bottom: 1px solid #e2e8f0; text-align: right;"><strong>{count}</strong></td>
                 </tr>
-                <tr style="background: #edf2f7;">
+"""
+
+_EMAIL_TOTAL_FMT = """                <tr style="background: #edf2f7;">
                     <td style="padding: 8px;"><strong>Total</strong></td>
                     <td style="padding: 8px; text-align: right;"><strong>{total}</strong></td>
                 </tr>
             </table>
         </div>
 
-        {concepts_html}
-        {actions_html}
+        """
+
+_EMAIL_FOOTER_FMT = """
 
         <hr style="border: none; border-top: 1px solid #e2e8f0; margin: 30px 0;">
         <p style="color: #a0aec0; font-size: 12px;">
             Generated by The Silent Cartographer<br>
-            {date.today().isoformat()}
+            {today}
         </p>
     </body>
     </html>
     """
 
+# Highlight summary rows as (label, color)
+_SUMMARY_ROWS = (
+    ("🟡 Concepts (Yellow)", "yellow"),
+    ("🩷 Actions (Pink)", "pink"),
+    ("🔵 Quotes (Blue)", "blue"),
+    ("🟠 Disagreements (Orange)", "orange"),
+)
+
+
+def _build_book_processed_email(
+    book: "ParsedBook",
+    concepts: list[Any],
+    actions: list[Any],
+    asana_urls: dict[str, str],
+) -> tuple[str, str]:
+    """Build email content for a processed book.
+
+    Returns:
+        Tuple of (subject, html_body).
+    """
+    counts = book.highlight_counts()
+    total = sum(counts.values())
+
+    subject = f"📚 TSC: Processed \"{book.metadata.title}\""
+
+    parts = [_EMAIL_HEADER_FMT.format(
+        title=book.metadata.title,
+        author=book.metadata.author,
+    )]
+    parts.extend(
+        _EMAIL_ROW_FMT.format(label=label, count=counts[color])
+        for label, color in _SUMMARY_ROWS
+    )
+    parts.append(_EMAIL_TOTAL_FMT.format(total=total))
+
+    # Key concepts section
+    if concepts:
+        parts.append(f"""
+        <h3>Key Concepts ({len(concepts)})</h3>
+        <ul>""")
+        parts.append("\n".join(
+            f"<li><strong>{c.name}</strong> — {c.description}</li>"
+            for c in concepts
+        ))
+        parts.append("""</ul>
+        """)
+
+    # Action items section
+    parts.append("\n        ")
+    if actions:
+        parts.append(f"""
+        <h3>Action Items ({len(actions)})</h3>
+        <ul>""")
+        for a in actions:
+            url = asana_urls.get(a.title, "")
+            link = f' <a href="{url}">[Asana]</a>' if url else ""
+            parts.append(f"<li>{a.title}{link}</li>")
+        parts.append("""</ul>
+        """)
+
+    parts.append(_EMAIL_FOOTER_FMT.format(today=date.today().isoformat()))
+    html_body = "".join(parts)
+
     return subject, html_body
 
 
@@ -166,6 +291,7 @@ async def send_notification(
     concepts: list[Any],
     actions: list[Any],
     asana_urls: dict[str, str],
+    client: Optional[EmailClient] = None,
 ) -> bool:
     """Send notification email for a processed book.
 
@@ -174,14 +300,16 @@ async def send_notification(
         concepts: Extracted concepts.
         actions: Extracted actions.
         asana_urls: Mapping of action titles to Asana URLs.
+        client: Email client to send with, e.g. one holding an open
+            session. A new client is created when None.
 
     Returns:
         True if email sent successfully.
     """
     try:
-        client = EmailClient()
+        client = client or EmailClient()
         subject, body = _build_book_processed_email(book, concepts, actions, asana_urls)
-        return client.send(subject, body)
+        return await client.send_async(subject, body)
     except ValueError as e:
         print(f"Warning: Email not configured: {e}")
         return False
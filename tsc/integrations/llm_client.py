@@ -1,15 +1,44 @@
 """Unified LLM client supporting both CLI and API modes."""
 
 import asyncio
-import subprocess
+import shutil
 from typing import Optional
 
 from tsc.config import get_settings
 
 
+# Model used in API mode
+MODEL = "claude-sonnet-4-20250514"
+
+# claude executable used in CLI mode, resolved once at import
+_CLAUDE_PATH = shutil.which("claude")
+
+# Extra attempts after a rate-limit error in API mode
+_RATE_LIMIT_RETRIES = 3
+
+# Limits concurrent LLM requests, created for the running event loop
+_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Get the request semaphore for the running event loop."""
+    global _semaphore, _semaphore_loop
+
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore = asyncio.Semaphore(get_settings().llm_concurrency)
+        _semaphore_loop = loop
+
+    return _semaphore
+
+
 async def query_llm(prompt: str, max_tokens: int = 4096) -> str:
     """Query LLM using configured mode (cli or api).
 
+    At most ``llm_concurrency`` requests are in flight at once; further
+    calls wait for a free slot.
+
     Args:
         prompt: The prompt to send to the LLM.
         max_tokens: Maximum tokens for response (used in API mode).
@@ -23,10 +52,22 @@ async def query_llm(prompt: str, max_tokens: int = 4096) -> str:
     """
     settings = get_settings()
 
-    if settings.llm_mode == "cli":
-        return await _query_cli(prompt)
-    else:
-        return await _query_api(prompt, max_tokens)
+    async with _get_semaphore():
+        if settings.llm_mode == "cli":
+            return await _query_cli(prompt)
+        else:
+            return await _query_api(prompt, max_tokens)
+
+
+async def aclose_llm_client() -> None:
+    """Close pooled API connections, if an API client was created.
+
+    Call before the event loop shuts down.
+    """
+    if get_settings().llm_mode == "api":
+        from tsc.integrations.anthropic_client import aclose_client
+
+        await aclose_client()
 
 
 async def _query_cli(prompt: str) -> str:
@@ -43,40 +84,34 @@ async def _query_cli(prompt: str) -> str:
     Raises:
         RuntimeError: If CLI call fails.
     """
-    import shutil
-
-    loop = asyncio.get_event_loop()
-
-    # Find claude executable
-    claude_path = shutil.which("claude")
-    if not claude_path:
+    if not _CLAUDE_PATH:
         raise RuntimeError(
             "Claude CLI not found. Install with: npm install -g @anthropic-ai/claude-code"
         )
 
-    # Pass prompt via stdin to handle long prompts that exceed command-line limits
-    result = await loop.run_in_executor(
-        None,
-        lambda: subprocess.run(
-            [claude_path, "-p", "--output-format", "text"],
-            input=prompt,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-        ),
+    proc = await asyncio.create_subprocess_exec(
+        _CLAUDE_PATH, "-p", "--output-format", "text",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
     )
 
-    if result.returncode != 0:
+    # Pass prompt via stdin to handle long prompts that exceed command-line limits
+    stdout_bytes, stderr_bytes = await proc.communicate(prompt.encode("utf-8"))
+    stdout = stdout_bytes.decode("utf-8")
+    stderr = stderr_bytes.decode("utf-8", errors="replace")
+
+    if proc.returncode != 0:
         raise RuntimeError(
-            f"Claude CLI failed with code {result.returncode}: {result.stderr}"
+            f"Claude CLI failed with code {proc.returncode}: {stderr}"
         )
 
-    if not result.stdout.strip():
+    if not stdout.strip():
         raise RuntimeError(
-            f"Claude CLI returned empty response. stderr: {result.stderr}"
+            f"Claude CLI returned empty response. stderr: {stderr}"
         )
 
-    return result.stdout
+    return stdout
 
 
 async def _query_api(prompt: str, max_tokens: int) -> str:
@@ -92,12 +127,28 @@ async def _query_api(prompt: str, max_tokens: int) -> str:
     Raises:
         ValueError: If API key is not configured.
     """
+    import anthropic
+
     from tsc.integrations.anthropic_client import get_anthropic_client
 
     client = get_anthropic_client()
-    response = await client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=max_tokens,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return response.content[0].text
+    for attempt in range(_RATE_LIMIT_RETRIES + 1):
+        try:
+            # Stream the response so long generations are not cut off by
+            # the non-streaming request timeout
+            async with client.messages.stream(
+                model=MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            ) as stream:
+                chunks = [text async for text in stream.text_stream]
+            return "".join(chunks)
+        except anthropic.RateLimitError as e:
+            if attempt == _RATE_LIMIT_RETRIES:
+                raise
+            # Wait as long as the API asks, backing off if it doesn't say
+            try:
+                delay = float(e.response.headers.get("retry-after", ""))
+            except ValueError:
+                delay = 2.0 ** (attempt + 1)
+            await asyncio.sleep(delay)
@@ -1,28 +1,212 @@
 """Semantic search for finding related notes in the vault."""
 
+import functools
+import json
+import math
+import os
+import pickle
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 import re
 
 from tsc.config import get_settings
+from tsc.generators.template_filler import FilledTemplate
+from tsc.parsers.models import BookMetadata, Highlight
+
+if TYPE_CHECKING:
+    import numpy as np
+    from tsc.processors.concept_extractor import ExtractedConcept
+
+
+# Small local model used for concept and note embeddings
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Minimum cosine similarity for a note to count as related
+_MIN_RELATED_SIMILARITY = 0.3
+
+# Bump when the layout of the persisted note index changes
+_NOTE_INDEX_VERSION = 1
+
+# Threads reading changed notes; reads are IO-bound and release the GIL
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Words of three or more letters, used as keywords
+_TOKEN = re.compile(r"\b[a-zA-Z]{3,}\b")
+
+# Common words that carry no meaning as keywords
+_STOPWORDS = frozenset({
+    'the', 'and', 'for', 'that', 'this', 'with', 'from', 'are', 'was',
+    'were', 'been', 'being', 'have', 'has', 'had', 'does', 'did', 'will',
+    'would', 'could', 'should', 'may', 'might', 'must', 'shall', 'can',
+    'need', 'about', 'into', 'through', 'during', 'before', 'after',
+    'above', 'below', 'between', 'under', 'again', 'further', 'then',
+    'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
+    'each', 'few', 'more', 'most', 'other', 'some', 'such', 'only',
+    'own', 'same', 'than', 'too', 'very', 'just', 'also',
+})
+
+# BM25 term-frequency saturation and length normalization
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+# Weight of a keyword appearing in a note's title, relative to its IDF
+_TITLE_WEIGHT = 3.0
+
+
+def _scan_markdown(root: str) -> Iterator[os.DirEntry]:
+    """Yield every markdown file under a directory, recursively.
+
+    Uses os.scandir directly to avoid creating a Path per file.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".md"):
+                        yield entry
+        except OSError:
+            continue
+
+
+def _read_note(path: str) -> Optional[str]:
+    """Read a note as UTF-8, or None if it cannot be read."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+@dataclass(slots=True, frozen=True)
+class _NoteTokens:
+    """Keyword tokens of one note, reused while its file is unchanged."""
+
+    stat: tuple[int, int]  # (mtime_ns, size) of the file they came from
+    counts: Counter  # Content token -> occurrences
+    title_tokens: frozenset[str]
+
+
+class _KeywordIndex:
+    """Inverted index over note titles and contents, scored with BM25.
+
+    Lookups only touch the posting lists of the query keywords, so their
+    cost grows with the number of matches rather than the vault size.
+    """
+
+    def __init__(self, notes: list[tuple[str, _NoteTokens]]):
+        """Build posting lists from tokenized notes.
+
+        Args:
+            notes: (title, tokens) pairs, one per note.
+        """
+        self.titles = [title for title, _ in notes]
+        # Token -> [(doc_id, term frequency)] over note contents
+        self.postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        # Token -> doc_ids whose title contains it
+        self.title_postings: dict[str, list[int]] = defaultdict(list)
+        self.doc_lens: list[int] = []
+
+        for doc_id, (_, tokens) in enumerate(notes):
+            for token, tf in tokens.counts.items():
+                self.postings[token].append((doc_id, tf))
+            for token in tokens.title_tokens:
+                self.title_postings[token].append(doc_id)
+            self.doc_lens.append(sum(tokens.counts.values()))
+
+        self.avg_doc_len = sum(self.doc_lens) / len(self.doc_lens) if self.doc_lens else 0.0
+
+    def score(self, keywords: set[str]) -> dict[int, float]:
+        """Score the notes matching any keyword.
+
+        Args:
+            keywords: Lowercased query keywords.
+
+        Returns:
+            Dict mapping doc_id to BM25 score, for matching notes only.
+        """
+        n_docs = len(self.titles)
+        avg_len = self.avg_doc_len or 1.0
+        scores: dict[int, float] = defaultdict(float)
+
+        for keyword in keywords:
+            postings = self.postings.get(keyword, ())
+            title_postings = self.title_postings.get(keyword, ())
+            if not postings and not title_postings:
+                continue
+
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+            for doc_id, tf in postings:
+                norm = 1 - _BM25_B + _BM25_B * self.doc_lens[doc_id] / avg_len
+                scores[doc_id] += idf * tf * (_BM25_K1 + 1) / (tf + _BM25_K1 * norm)
+            for doc_id in title_postings:
+                scores[doc_id] += _TITLE_WEIGHT * idf
+
+        return scores
+
+
+@functools.lru_cache(maxsize=1)
+def _get_embedding_model():
+    """Load the sentence-transformers model once per process."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+@functools.lru_cache(maxsize=256)
+def _embed(text: str) -> "np.ndarray":
+    """Embed text as a unit-length vector."""
+    return _get_embedding_model().encode(text, normalize_embeddings=True)
 
 
 class SemanticSearch:
     """Search for semantically related notes in the Obsidian vault.
 
-    For now, this uses simple text matching. Can be upgraded to use
-    sentence-transformers for true semantic similarity.
+    Notes are embedded once with sentence-transformers and searched by
+    cosine similarity. Falls back to keyword matching when
+    sentence-transformers is not installed.
+
+    Note contents and embeddings are persisted between runs, keyed by each
+    file's modification time and size, so only new or changed notes are
+    read and embedded again.
     """
 
-    def __init__(self, vault_path: Optional[Path] = None):
+    def __init__(self, vault_path: Optional[Path] = None, index_file: Optional[Path] = None):
         """Initialize search with vault path.
 
         Args:
             vault_path: Path to Obsidian vault. Uses config if not provided.
+            index_file: Path to the persisted note index. Uses the LLM
+                cache directory if not provided.
         """
         settings = get_settings()
         self.vault_path = vault_path or settings.tsc_vault_path
+        self.index_file = index_file or settings.llm_cache_dir / "note_index.pkl"
+        # File path -> (mtime_ns, size, content, float16 embedding or None)
+        self._files: dict[str, tuple] = {}
+        # Note title -> file path it was loaded from
+        self._note_paths: dict[str, str] = {}
         self._note_cache: Optional[dict[str, str]] = None
+        self._title_cache: Optional[list[str]] = None
+        self._embeddings: Optional["np.ndarray"] = None
+        self._keyword_index: Optional[_KeywordIndex] = None
+        # File path -> tokens; survives invalidate() and is checked per file
+        self._note_tokens: dict[str, _NoteTokens] = {}
+
+    def invalidate(self) -> None:
+        """Forget cached notes so the next lookup rescans the vault."""
+        self._note_cache = None
+        self._title_cache = None
+        self._embeddings = None
+        self._keyword_index = None
 
     def _load_notes(self) -> dict[str, str]:
         """Load all markdown notes from vault.
@@ -33,29 +217,132 @@ class SemanticSearch:
         if self._note_cache is not None:
             return self._note_cache
 
-        notes = {}
+        # After invalidate(), the entries already in memory are the baseline
+        persisted = self._files or self._read_note_index()
+        files = {}
+        paths = []
+        stale = []
         ideas_dir = self.vault_path / "Ideas"
 
         if ideas_dir.exists():
-            for md_file in ideas_dir.glob("**/*.md"):
-                title = md_file.stem
+            for entry in _scan_markdown(str(ideas_dir)):
                 try:
-                    content = md_file.read_text(encoding="utf-8")
-                    notes[title] = content
-                except Exception:
-                    pass
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                key = (stat.st_mtime_ns, stat.st_size)
+                cached = persisted.get(entry.path)
+                if cached is not None and cached[:2] == key:
+                    files[entry.path] = cached
+                else:
+                    stale.append((entry.path, key))
+                paths.append(entry.path)
+
+        # Only new or changed notes are read, overlapping their IO
+        if stale:
+            with ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+                contents = pool.map(_read_note, [path for path, _ in stale])
+                for (path, key), content in zip(stale, contents):
+                    if content is not None:
+                        files[path] = key + (content, None)
+
+        notes = {}
+        note_paths = {}
+        for path in paths:
+            if path in files:
+                title = os.path.basename(path)[:-3]
+                notes[title] = files[path][2]
+                note_paths[title] = path
 
+        self._files = files
+        self._note_paths = note_paths
         self._note_cache = notes
+        if stale or len(files) != len(persisted):
+            self._write_note_index()
         return notes
 
+    def _read_note_index(self) -> dict[str, tuple]:
+        """Load the persisted note index, or nothing if missing or stale."""
+        try:
+            with open(self.index_file, "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            return {}
+
+        if data.get("version") != _NOTE_INDEX_VERSION or data.get("vault") != str(self.vault_path):
+            return {}
+        return data["files"]
+
+    def _write_note_index(self) -> None:
+        """Atomically persist the note index; failures only cost a rescan."""
+        tmp_file = self.index_file.with_suffix(".tmp")
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, "wb") as f:
+                pickle.dump(
+                    {
+                        "version": _NOTE_INDEX_VERSION,
+                        "vault": str(self.vault_path),
+                        "files": self._files,
+                    },
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            tmp_file.unlink(missing_ok=True)
+
+    def _build_index(self) -> "np.ndarray":
+        """Embed every note, reusing persisted embeddings of unchanged notes.
+
+        Returns:
+            Unit-length note embeddings, one row per note in
+            ``_load_notes()`` order.
+
+        Raises:
+            ImportError: If sentence-transformers is not installed.
+        """
+        if self._embeddings is not None:
+            return self._embeddings
+
+        import numpy as np
+
+        notes = self._load_notes()
+        paths = [self._note_paths[title] for title in notes]
+        missing = [path for path in paths if self._files[path][3] is None]
+
+        if missing:
+            vectors = _get_embedding_model().encode(
+                [f"{Path(path).stem}\n{self._files[path][2]}" for path in missing],
+                batch_size=64,
+                normalize_embeddings=True,
+            )
+            # Stored as float16 to halve the index size; ample for cosine ranking
+            for path, vector in zip(missing, vectors):
+                self._files[path] = self._files[path][:3] + (np.asarray(vector, dtype=np.float16),)
+            self._write_note_index()
+
+        self._embeddings = np.array([self._files[path][3] for path in paths], dtype=np.float32)
+        return self._embeddings
+
     def get_all_note_titles(self) -> list[str]:
         """Get all note titles in the Ideas folder.
 
+        Only file names are listed; note contents are not read.
+
         Returns:
             List of note titles (without .md extension).
         """
-        notes = self._load_notes()
-        return list(notes.keys())
+        if self._title_cache is None:
+            if self._note_cache is not None:
+                self._title_cache = list(self._note_cache)
+            else:
+                ideas_dir = self.vault_path / "Ideas"
+                self._title_cache = [
+                    entry.name[:-3] for entry in _scan_markdown(str(ideas_dir))
+                ]
+
+        return list(self._title_cache)
 
     def find_related(
         self,
@@ -65,8 +352,8 @@ class SemanticSearch:
     ) -> list[str]:
         """Find notes related to a concept.
 
-        Uses simple keyword matching for now. Can be upgraded to
-        use embeddings for semantic similarity.
+        Ranks notes by embedding similarity to the concept, or by keyword
+        overlap if sentence-transformers is not installed.
 
         Args:
             concept_name: Name of the concept.
@@ -81,49 +368,254 @@ class SemanticSearch:
         if not notes:
             return []
 
-        # Extract keywords from concept
-        keywords = set()
-        for text in [concept_name, concept_description]:
-            # Simple tokenization
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-            keywords.update(words)
-
-        # Remove common words
-        stopwords = {
-            'the', 'and', 'for', 'that', 'this', 'with', 'from', 'are', 'was',
-            'were', 'been', 'being', 'have', 'has', 'had', 'does', 'did', 'will',
-            'would', 'could', 'should', 'may', 'might', 'must', 'shall', 'can',
-            'need', 'about', 'into', 'through', 'during', 'before', 'after',
-            'above', 'below', 'between', 'under', 'again', 'further', 'then',
-            'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
-            'each', 'few', 'more', 'most', 'other', 'some', 'such', 'only',
-            'own', 'same', 'than', 'too', 'very', 'just', 'also',
-        }
-        keywords -= stopwords
+        try:
+            embeddings = self._build_index()
+            query = _embed(f"{concept_name}\n{concept_description}")
+        except ImportError:
+            return self._find_related_keywords(notes, concept_name, concept_description, top_k)
+
+        import numpy as np
+
+        scores = embeddings @ query
+        k = min(top_k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        titles = list(notes)
+        return [titles[i] for i in top if scores[i] >= _MIN_RELATED_SIMILARITY]
+
+    def _tokenize_notes(self) -> list[tuple[str, _NoteTokens]]:
+        """Tokenize the loaded notes, reusing tokens of unchanged files.
+
+        Returns:
+            (title, tokens) pairs in ``_load_notes()`` order.
+        """
+        note_tokens = {}
+        tokenized = []
+        for title, path in self._note_paths.items():
+            mtime_ns, size, content, _ = self._files[path]
+            tokens = self._note_tokens.get(path)
+            if tokens is None or tokens.stat != (mtime_ns, size):
+                tokens = _NoteTokens(
+                    stat=(mtime_ns, size),
+                    counts=Counter(_TOKEN.findall(content.lower())),
+                    title_tokens=frozenset(_TOKEN.findall(title.lower())),
+                )
+            note_tokens[path] = tokens
+            tokenized.append((title, tokens))
+
+        self._note_tokens = note_tokens
+        return tokenized
+
+    def _find_related_keywords(
+        self,
+        notes: dict[str, str],
+        concept_name: str,
+        concept_description: str,
+        top_k: int,
+    ) -> list[str]:
+        """Rank notes by BM25 keyword relevance to a concept."""
+        # Extract keywords from concept, minus common words
+        keywords = {
+            word
+            for text in (concept_name, concept_description)
+            for word in _TOKEN.findall(text.lower())
+        } - _STOPWORDS
 
         if not keywords:
             return []
 
-        # Score each note by keyword overlap
-        scores = []
-        for title, content in notes.items():
-            content_lower = content.lower()
-            title_lower = title.lower()
+        if self._keyword_index is None:
+            self._keyword_index = _KeywordIndex(self._tokenize_notes())
+        index = self._keyword_index
+
+        # Sort matching notes by score and return top_k
+        scores = sorted(index.score(keywords).items(), key=lambda x: x[1], reverse=True)
+        return [index.titles[doc_id] for doc_id, _ in scores[:top_k]]
+
+
+class SemanticTemplateCache:
+    """Reuse filled templates for near-duplicate concepts across books.
+
+    Concepts are embedded from their name and description. A concept whose
+    cosine similarity to a previously filled one meets the threshold reuses
+    that template, with only the book-specific source citation rewritten,
+    instead of making a fresh LLM call.
+
+    The cache is best effort: if the embedding model cannot be loaded it
+    stops matching and every lookup is a miss. Methods are blocking and
+    thread-safe, so async callers run them with ``asyncio.to_thread``.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None, threshold: float = 0.92):
+        """Initialize cache with its backing file.
+
+        Args:
+            cache_file: Path to the cache JSON file. Uses the LLM cache
+                directory if not provided.
+            threshold: Minimum cosine similarity for a cache hit.
+        """
+        settings = get_settings()
+        self.cache_file = cache_file or settings.llm_cache_dir / "semantic_templates.json"
+        self.threshold = threshold
+        self._entries: Optional[list[dict]] = None
+        self._matrix: Optional["np.ndarray"] = None
+        self._lock = threading.Lock()
+        # Set once embedding fails, so the model load isn't retried per concept
+        self._disabled = False
+        # Cleared when the cache file exists but can't be read, to keep it
+        self._writable = True
+
+    def _load(self) -> list[dict]:
+        """Load cached entries from disk."""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = []
+        if self.cache_file.exists():
+            try:
+                entries = json.loads(self.cache_file.read_text(encoding="utf-8"))
+                if entries:
+                    import numpy as np
+
+                    self._matrix = np.array([e["embedding"] for e in entries])
+                self._entries = entries
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Warning: Cannot read template cache {self.cache_file}, leaving it untouched: {e}")
+                self._writable = False
+
+        return self._entries
+
+    @staticmethod
+    def _concept_text(concept: "ExtractedConcept") -> str:
+        """Text embedded for a concept."""
+        return f"{concept.name}: {concept.description}"
+
+    def _embed_concept(self, concept: "ExtractedConcept") -> Optional["np.ndarray"]:
+        """Embed a concept, or return None if embedding is unavailable."""
+        if self._disabled:
+            return None
+        try:
+            return _embed(self._concept_text(concept))
+        except Exception as e:
+            print(f"Warning: Semantic template cache disabled, embedding failed: {e}")
+            self._disabled = True
+            return None
+
+    def _lookup(
+        self,
+        concept: "ExtractedConcept",
+        metadata: BookMetadata,
+        supporting_highlights: list[Highlight],
+    ) -> Optional[FilledTemplate]:
+        """Find a filled template for one concept; the lock must be held."""
+        if not self._load():
+            return None
+
+        embedding = self._embed_concept(concept)
+        if embedding is None:
+            return None
+
+        scores = self._matrix @ embedding
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return None
+
+        # Only the source citation is specific to the book
+        sources = f"\"{metadata.title}\" by {metadata.author}"
+        if supporting_highlights:
+            sources += f" — \"{supporting_highlights[0].text}\""
+
+        filled = FilledTemplate(**self._entries[best]["filled"])
+        return filled.model_copy(update={"connections_sources": sources})
+
+    def lookup(
+        self,
+        concepts: list["ExtractedConcept"],
+        metadata: BookMetadata,
+        supporting_highlights: list[list[Highlight]],
+    ) -> list[Optional[FilledTemplate]]:
+        """Find filled templates for near-duplicates of a book's concepts.
+
+        Args:
+            concepts: The concepts about to be filled.
+            metadata: Metadata of the book the concepts come from.
+            supporting_highlights: Each concept's supporting highlights.
+
+        Returns:
+            The cached template adapted to this book for each concept, or
+            None where there is no match.
+        """
+        with self._lock:
+            return [
+                self._lookup(concept, metadata, supporting)
+                for concept, supporting in zip(concepts, supporting_highlights)
+            ]
 
-            # Count keyword matches
-            score = 0
-            for keyword in keywords:
-                if keyword in title_lower:
-                    score += 3  # Title match worth more
-                if keyword in content_lower:
-                    score += content_lower.count(keyword)
+    def add(
+        self,
+        concepts: list["ExtractedConcept"],
+        filled: list[FilledTemplate],
+        metadata: BookMetadata,
+    ) -> None:
+        """Store a book's freshly filled templates and save the cache once.
+
+        Args:
+            concepts: The concepts that were filled.
+            filled: The LLM-filled template for each concept.
+            metadata: Metadata of the book the concepts come from.
+        """
+        with self._lock:
+            entries = self._load()
+            embeddings = []
+            for concept in concepts:
+                embedding = self._embed_concept(concept)
+                if embedding is None:
+                    return
+                embeddings.append(embedding)
+            if not embeddings:
+                return
 
-            if score > 0:
-                scores.append((title, score))
+            # Embeddings come back as arrays, so numpy is available here
+            import numpy as np
 
-        # Sort by score and return top_k
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return [title for title, _ in scores[:top_k]]
+            entries.extend(
+                {
+                    "concept_name": concept.name,
+                    "book_title": metadata.title,
+                    "embedding": embedding.tolist(),
+                    "filled": template.model_dump(),
+                }
+                for concept, template, embedding in zip(concepts, filled, embeddings)
+            )
+            new_rows = np.vstack(embeddings)
+            self._matrix = new_rows if self._matrix is None else np.vstack([self._matrix, new_rows])
+
+            if self._writable:
+                self._save(entries)
+
+    def _save(self, entries: list[dict]) -> None:
+        """Atomically write the cache; a failed write only loses new entries."""
+        tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_text(json.dumps(entries), encoding="utf-8")
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"Warning: Failed to save template cache: {e}")
+            tmp_file.unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=1)
+def get_semantic_search() -> SemanticSearch:
+    """Get the process-wide search over the configured vault.
+
+    Its notes and index are loaded on first use and kept; call
+    ``invalidate()`` on it after writing notes to pick them up.
+    """
+    return SemanticSearch()
 
 
 async def find_related_notes(
@@ -133,6 +625,8 @@ async def find_related_notes(
 ) -> list[str]:
     """Find notes related to a concept.
 
+    Uses the shared search from ``get_semantic_search()``.
+
     Args:
         concept_name: Name of the concept.
         concept_description: Description of the concept.
@@ -141,5 +635,5 @@ async def find_related_notes(
     Returns:
         List of related note titles.
     """
-    search = SemanticSearch()
+    search = get_semantic_search()
     return search.find_related(concept_name, concept_description, top_k)
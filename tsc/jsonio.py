@@ -0,0 +1,46 @@
+"""Fast JSON encoding and decoding.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise, so callers never need to care which one is in use.
+"""
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+    import json
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON.
+
+    Args:
+        obj: JSON-compatible object.
+        indent: If True, pretty-print with two-space indentation.
+
+    Returns:
+        Encoded JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or a string.
+
+    Args:
+        data: Encoded JSON document.
+
+    Returns:
+        Decoded Python object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
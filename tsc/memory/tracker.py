@@ -1,9 +1,10 @@
 """Memory tracking for processed books and spaced repetition."""
 
-import json
+import os
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from pydantic import BaseModel, Field
 
@@ -34,18 +35,22 @@ class SpacedRepetitionEntry(BaseModel):
     review_count: int = Field(0, description="Number of reviews completed")
     next_review: date = Field(default_factory=date.today)
 
-    def schedule_next_review(self) -> None:
+    def schedule_next_review(self, today: Optional[date] = None) -> None:
         """Schedule next review using spaced repetition intervals.
 
         Intervals: 1 day, 3 days, 1 week, 2 weeks, 1 month, 3 months
+
+        Args:
+            today: Review date. Defaults to the current date.
         """
         intervals = [1, 3, 7, 14, 30, 90]
         interval_index = min(self.review_count, len(intervals) - 1)
         days = intervals[interval_index]
 
-        self.last_reviewed = date.today()
+        today = today or date.today()
+        self.last_reviewed = today
         self.review_count += 1
-        self.next_review = date.today() + timedelta(days=days)
+        self.next_review = today + timedelta(days=days)
 
 
 class MemoryState(BaseModel):
@@ -68,6 +73,13 @@ class MemoryTracker:
         settings = get_settings()
         self.memory_file = memory_file or settings.memory_file
         self._state: Optional[MemoryState] = None
+        self._batch_depth = 0
+        self._dirty = False
+        # Lookup indexes over the loaded state
+        self._processed_files: set[str] = set()
+        self._entries_by_name: dict[str, SpacedRepetitionEntry] = {}
+        # Running totals over processed books, for get_stats
+        self._totals = {"total_highlights": 0, "concepts_created": 0, "actions_created": 0}
 
     def _load(self) -> MemoryState:
         """Load state from disk."""
@@ -76,25 +88,62 @@ class MemoryTracker:
 
         if self.memory_file.exists():
             try:
-                data = json.loads(self.memory_file.read_text(encoding="utf-8"))
-                self._state = MemoryState(**data)
+                # Decode and validate in one pass inside pydantic-core
+                self._state = MemoryState.model_validate_json(self.memory_file.read_bytes())
             except Exception:
                 self._state = MemoryState()
         else:
             self._state = MemoryState()
 
+        self._processed_files = set()
+        self._totals = dict.fromkeys(self._totals, 0)
+        for record in self._state.processed_books:
+            self._index_record(record)
+        self._entries_by_name = {}
+        for entry in self._state.spaced_repetition:
+            # The first entry for a concept is the one that gets reviewed
+            self._entries_by_name.setdefault(entry.concept_name, entry)
+
         return self._state
 
+    def _index_record(self, record: ProcessedRecord) -> None:
+        """Add a processed book to the lookup index and running totals."""
+        self._processed_files.add(record.source_file)
+        self._totals["total_highlights"] += sum(record.highlight_counts.values())
+        self._totals["concepts_created"] += len(record.concepts_created)
+        self._totals["actions_created"] += len(record.actions_created)
+
     def _save(self) -> None:
-        """Save state to disk."""
+        """Save state to disk, or defer it while a batch is open."""
         if self._state is None:
             return
 
+        if self._batch_depth:
+            self._dirty = True
+            return
+
         self._state.last_updated = datetime.now()
-        self.memory_file.write_text(
-            self._state.model_dump_json(indent=2),
-            encoding="utf-8",
-        )
+
+        # Write to a temporary file and swap it in so a crash mid-write
+        # never leaves a truncated memory file behind
+        tmp_file = self.memory_file.with_name(self.memory_file.name + ".tmp")
+        tmp_file.write_text(self._state.model_dump_json(), encoding="utf-8")
+        os.replace(tmp_file, self.memory_file)
+        self._dirty = False
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer saving until the outermost batch exits.
+
+        Mutations made inside the block are written to disk once, on exit.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._save()
 
     def is_processed(self, source_file: str) -> bool:
         """Check if a file has already been processed.
@@ -105,8 +154,8 @@ class MemoryTracker:
         Returns:
             True if already processed.
         """
-        state = self._load()
-        return any(r.source_file == source_file for r in state.processed_books)
+        self._load()
+        return source_file in self._processed_files
 
     def add_processed_record(self, record: ProcessedRecord) -> None:
         """Add a record of a processed book.
@@ -116,6 +165,7 @@ class MemoryTracker:
         """
         state = self._load()
         state.processed_books.append(record)
+        self._index_record(record)
         self._save()
 
     def add_spaced_repetition_entry(self, entry: SpacedRepetitionEntry) -> None:
@@ -126,29 +176,48 @@ class MemoryTracker:
         """
         state = self._load()
         state.spaced_repetition.append(entry)
+        self._entries_by_name.setdefault(entry.concept_name, entry)
         self._save()
 
-    def get_due_reviews(self) -> list[SpacedRepetitionEntry]:
+    def extend_spaced_repetition_entries(
+        self,
+        entries: list[SpacedRepetitionEntry],
+    ) -> None:
+        """Add several concepts to spaced repetition schedule.
+
+        Args:
+            entries: Spaced repetition entries to add.
+        """
+        state = self._load()
+        state.spaced_repetition.extend(entries)
+        for entry in entries:
+            self._entries_by_name.setdefault(entry.concept_name, entry)
+        self._save()
+
+    def get_due_reviews(self, today: Optional[date] = None) -> list[SpacedRepetitionEntry]:
         """Get concepts due for review.
 
+        Args:
+            today: Reference date. Defaults to the current date.
+
         Returns:
             List of entries due for review today or earlier.
         """
         state = self._load()
-        today = date.today()
+        today = today or date.today()
         return [e for e in state.spaced_repetition if e.next_review <= today]
 
-    def mark_reviewed(self, concept_name: str) -> None:
+    def mark_reviewed(self, concept_name: str, today: Optional[date] = None) -> None:
         """Mark a concept as reviewed and schedule next review.
 
         Args:
             concept_name: Name of the concept reviewed.
+            today: Review date. Defaults to the current date.
         """
-        state = self._load()
-        for entry in state.spaced_repetition:
-            if entry.concept_name == concept_name:
-                entry.schedule_next_review()
-                break
+        self._load()
+        entry = self._entries_by_name.get(concept_name)
+        if entry is not None:
+            entry.schedule_next_review(today)
         self._save()
 
     def get_stats(self) -> dict:
@@ -159,20 +228,9 @@ class MemoryTracker:
         """
         state = self._load()
 
-        total_highlights = sum(
-            sum(r.highlight_counts.values())
-            for r in state.processed_books
-        )
-
         return {
             "books_processed": len(state.processed_books),
-            "total_highlights": total_highlights,
-            "concepts_created": sum(
-                len(r.concepts_created) for r in state.processed_books
-            ),
-            "actions_created": sum(
-                len(r.actions_created) for r in state.processed_books
-            ),
+            **self._totals,
             "pending_reviews": len(self.get_due_reviews()),
             "total_in_rotation": len(state.spaced_repetition),
         }
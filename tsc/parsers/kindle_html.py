@@ -3,9 +3,8 @@
 import re
 from pathlib import Path
 from typing import Optional
-import warnings
 
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+from lxml import etree
 
 from tsc.parsers.models import (
     BookMetadata,
@@ -14,32 +13,31 @@ from tsc.parsers.models import (
     ParsedBook,
 )
 
-# Suppress XML parsing warning since Kindle exports are XHTML
-warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+# Bytes of the export fed to the parser at a time
+_READ_CHUNK_SIZE = 64 * 1024
 
+# "Page X" or "Location YYY" in a note heading
+_LOCATION_FIELD = re.compile(r"(Page|Location)\s+(\d+)", re.IGNORECASE)
 
-def _extract_color(note_heading: str, heading_element) -> HighlightColor:
+# Span class marking each highlight color, in lookup order
+_COLOR_SPAN_CLASSES = tuple((f"highlight_{color.value}", color) for color in HighlightColor)
+
+
+def _extract_color(note_heading: str, span_classes: list[str]) -> HighlightColor:
     """Extract highlight color from note heading.
 
     Looks for color class on span element or color word in text.
     """
     # Check for color spans
-    if heading_element:
-        for color in HighlightColor:
-            span = heading_element.find("span", class_=f"highlight_{color.value}")
-            if span:
-                return color
+    for span_class, color in _COLOR_SPAN_CLASSES:
+        if span_class in span_classes:
+            return color
 
     # Fallback: check text content
     heading_lower = note_heading.lower()
-    if "yellow" in heading_lower:
-        return HighlightColor.YELLOW
-    elif "pink" in heading_lower:
-        return HighlightColor.PINK
-    elif "blue" in heading_lower:
-        return HighlightColor.BLUE
-    elif "orange" in heading_lower:
-        return HighlightColor.ORANGE
+    for color in HighlightColor:
+        if color.value in heading_lower:
+            return color
 
     # Default to yellow if color not detected
     return HighlightColor.YELLOW
@@ -57,15 +55,13 @@ def _extract_location(note_heading: str) -> tuple[Optional[int], Optional[int]]:
     page = None
     location = None
 
-    # Extract page number
-    page_match = re.search(r"Page\s+(\d+)", note_heading, re.IGNORECASE)
-    if page_match:
-        page = int(page_match.group(1))
-
-    # Extract location
-    loc_match = re.search(r"Location\s+(\d+)", note_heading, re.IGNORECASE)
-    if loc_match:
-        location = int(loc_match.group(1))
+    # Take the first page and the first location in a single scan
+    for match in _LOCATION_FIELD.finditer(note_heading):
+        if match.group(1).lower() == "page":
+            if page is None:
+                page = int(match.group(2))
+        elif location is None:
+            location = int(match.group(2))
 
     return page, location
 
@@ -82,6 +78,145 @@ def _is_user_note(heading_text: str) -> bool:
     return heading_lower.strip().startswith("note -") or heading_lower.strip().startswith("note-")
 
 
+class _NotebookTarget:
+    """lxml parser target collecting a Kindle notebook's metadata and highlights.
+
+    Parse events arrive in document order, so each note heading is paired
+    with the note text that follows it whether the export nests the text
+    inside the heading or not. Text is captured the way BeautifulSoup's
+    ``get_text(strip=True)`` does: each text node is stripped and the
+    non-empty ones are joined.
+    """
+
+    def __init__(self):
+        """Initialize empty parse state."""
+        self.title: Optional[str] = None
+        self.author: Optional[str] = None
+        self.highlights: list[Highlight] = []
+        self.by_color: dict[HighlightColor, list[Highlight]] = {color: [] for color in HighlightColor}
+
+        self._chapter: Optional[str] = None
+        # (heading text, span classes) waiting for its note text
+        self._heading: Optional[tuple[str, list[str]]] = None
+        self._span_classes: list[str] = []
+
+        # Field whose text is being captured, and the depth it started at
+        self._field: Optional[str] = None
+        self._field_depth = 0
+        self._depth = 0
+        self._parts: list[str] = []
+        self._text: list[str] = []
+
+    def start(self, tag: str, attrib) -> None:
+        """Handle an opening tag."""
+        self._flush_text()
+        classes = attrib.get("class", "")
+
+        # Malformed exports leave the next heading inside the note text
+        if self._field == "note" and tag in ("h2", "h3"):
+            self._finish_field()
+        # ...and without an enclosing div, the note text inside the heading
+        elif self._field == "heading" and tag == "div" and classes == "noteText":
+            self._finish_field()
+
+        self._depth += 1
+
+        if self._field is None:
+            if tag == "h2" and classes == "sectionHeading":
+                self._start_field("section")
+            elif tag == "h3" and classes == "noteHeading":
+                self._span_classes = []
+                self._start_field("heading")
+            elif tag == "div" and classes == "noteText" and self._heading is not None:
+                self._start_field("note")
+            elif tag == "div" and self.title is None and "bookTitle" in classes.split():
+                self._start_field("title")
+            elif tag == "div" and self.author is None and "authors" in classes.split():
+                self._start_field("author")
+        elif self._field == "heading" and tag == "span":
+            self._span_classes.extend(classes.split())
+
+    def end(self, tag: str) -> None:
+        """Handle a closing tag."""
+        self._flush_text()
+        if self._field is not None and self._depth == self._field_depth:
+            self._finish_field()
+        self._depth -= 1
+
+    def data(self, data: str) -> None:
+        """Handle character data."""
+        if self._field is not None:
+            self._text.append(data)
+
+    def close(self) -> "_NotebookTarget":
+        """Finish parsing."""
+        self._flush_text()
+        if self._field is not None:
+            self._finish_field()
+        return self
+
+    def _start_field(self, field: str) -> None:
+        """Start capturing the text of the current element."""
+        self._field = field
+        self._field_depth = self._depth
+        self._parts = []
+
+    def _flush_text(self) -> None:
+        """End the current text node."""
+        if self._text:
+            text = "".join(self._text).strip()
+            if text:
+                self._parts.append(text)
+            self._text = []
+
+    def _finish_field(self) -> None:
+        """Store the captured text of the current field."""
+        field = self._field
+        text = "".join(self._parts)
+        self._field = None
+        self._parts = []
+
+        if field == "title":
+            self.title = text
+        elif field == "author":
+            self.author = text
+        elif field == "section":
+            self._chapter = text
+            self._heading = None
+        elif field == "heading":
+            self._heading = (text, self._span_classes)
+        elif field == "note":
+            heading_text, span_classes = self._heading
+            self._heading = None
+            self._add_note(heading_text, span_classes, text)
+
+    def _add_note(self, heading_text: str, span_classes: list[str], note_text: str) -> None:
+        """Record a note heading and its text as a highlight."""
+        # User notes (not highlights) are not kept
+        if _is_user_note(heading_text):
+            return
+
+        # Skip if not a highlight
+        if not _is_note_heading(heading_text):
+            return
+
+        # Extract properties
+        color = _extract_color(heading_text, span_classes)
+        page, location = _extract_location(heading_text)
+
+        highlight = Highlight(
+            text=note_text,
+            color=color,
+            page=page,
+            location=location,
+            chapter=self._chapter,
+            note=None,
+        )
+        # Group by color as highlights arrive so routing needs no second pass
+        self.highlights.append(highlight)
+        self.by_color[color].append(highlight)
+
+
 def parse_kindle_html(file_path: Path) -> ParsedBook:
     """Parse a Kindle HTML notebook export.
 
@@ -99,111 +234,27 @@ def parse_kindle_html(file_path: Path) -> ParsedBook:
     Returns:
         ParsedBook with metadata and all highlights.
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # Use html.parser for more lenient parsing of malformed HTML
-    soup = BeautifulSoup(content, "html.parser")
-
-    # Extract book metadata
-    title_elem = soup.find("div", class_="bookTitle")
-    title = title_elem.get_text(strip=True) if title_elem else "Unknown Title"
-
-    author_elem = soup.find("div", class_="authors")
-    author = author_elem.get_text(strip=True) if author_elem else "Unknown Author"
+    # Stream the file through one lenient libxml2 pass; the target sees
+    # every element in order and no document tree is built
+    notebook = _NotebookTarget()
+    parser = etree.HTMLParser(target=notebook, encoding="utf-8")
+    with open(file_path, "rb") as f:
+        fed = False
+        while chunk := f.read(_READ_CHUNK_SIZE):
+            parser.feed(chunk)
+            fed = True
+    # libxml2 rejects a document with no content at all
+    if fed:
+        parser.close()
 
     metadata = BookMetadata(
-        title=title,
-        author=author,
+        title=notebook.title if notebook.title is not None else "Unknown Title",
+        author=notebook.author if notebook.author is not None else "Unknown Author",
         source_file=file_path,
     )
 
-    # Parse highlights using regex to handle malformed HTML
-    # The Kindle format often has: <h3 class='noteHeading'>Heading</div><div class='noteText'>Text</h3>
-    # which is malformed, so we'll use regex to extract the pairs
-
-    highlights: list[Highlight] = []
-    current_chapter: Optional[str] = None
-    pending_user_note: Optional[str] = None
-
-    # Find all section headings and note headings
-    # Use regex to find note heading + note text pairs
-    pattern = re.compile(
-        r"<h3\s+class=['\"]noteHeading['\"]>(.*?)</(?:h3|div)>\s*<div\s+class=['\"]noteText['\"]>(.*?)</(?:h3|div)>",
-        re.DOTALL | re.IGNORECASE
-    )
-
-    # Also find section headings
-    section_pattern = re.compile(
-        r"<h2\s+class=['\"]sectionHeading['\"]>(.*?)</h2>",
-        re.DOTALL | re.IGNORECASE
-    )
-
-    # Build a list of all elements with their positions
-    elements = []
-
-    for match in section_pattern.finditer(content):
-        section_text = BeautifulSoup(match.group(1), "html.parser").get_text(strip=True)
-        elements.append((match.start(), "section", section_text, None))
-
-    for match in pattern.finditer(content):
-        heading_html = match.group(1)
-        note_html = match.group(2)
-
-        # Parse the heading to extract color info
-        heading_soup = BeautifulSoup(heading_html, "html.parser")
-        heading_text = heading_soup.get_text(strip=True)
-        note_text = BeautifulSoup(note_html, "html.parser").get_text(strip=True)
-
-        elements.append((match.start(), "note", heading_text, (note_text, heading_soup)))
-
-    # Sort by position
-    elements.sort(key=lambda x: x[0])
-
-    # Process elements in order
-    for pos, elem_type, text, extra in elements:
-        if elem_type == "section":
-            current_chapter = text
-
-        elif elem_type == "note":
-            heading_text = text
-            note_text, heading_soup = extra
-
-            # Check if this is a user note (not a highlight)
-            if _is_user_note(heading_text):
-                # Store as pending note to attach to previous highlight
-                pending_user_note = note_text
-                continue
-
-            # Skip if not a highlight
-            if not _is_note_heading(heading_text):
-                continue
-
-            # Extract properties
-            color = _extract_color(heading_text, heading_soup)
-            page, location = _extract_location(heading_text)
-
-            highlight = Highlight(
-                text=note_text,
-                color=color,
-                page=page,
-                location=location,
-                chapter=current_chapter,
-                note=None,  # Will be set if next element is a user note
-            )
-            highlights.append(highlight)
-
-            # If there was a pending user note, it should have been attached to previous highlight
-            # Reset it for the next iteration
-            pending_user_note = None
-
-    # Attach any pending user notes to their preceding highlights
-    # We need to re-process to handle notes that follow highlights
-    for i, h in enumerate(highlights[:-1]):
-        # Check if there's a note between this highlight and the next
-        pass  # The current approach handles this inline
-
-    return ParsedBook(
+    return ParsedBook.from_color_groups(
         metadata=metadata,
-        highlights=highlights,
+        highlights=notebook.highlights,
+        by_color=notebook.by_color,
     )
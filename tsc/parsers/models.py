@@ -1,11 +1,12 @@
 """Data models for parsed highlights."""
 
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class HighlightColor(str, Enum):
@@ -17,15 +18,20 @@ class HighlightColor(str, Enum):
     ORANGE = "orange"  # Disagreements -> Store in book note
 
 
-class Highlight(BaseModel):
-    """A single highlight from a book."""
+@dataclass(slots=True, frozen=True)
+class Highlight:
+    """A single highlight from a book.
 
-    text: str = Field(..., description="The highlighted text")
-    color: HighlightColor = Field(..., description="Highlight color")
-    page: Optional[int] = Field(None, description="Page number if available")
-    location: Optional[int] = Field(None, description="Kindle location")
-    chapter: Optional[str] = Field(None, description="Chapter or section heading")
-    note: Optional[str] = Field(None, description="User note attached to highlight")
+    A slotted, frozen dataclass rather than a model: books hold thousands of
+    highlights, and they are only ever built by the parser from typed values.
+    """
+
+    text: str  # The highlighted text
+    color: HighlightColor  # Highlight color
+    page: Optional[int] = None  # Page number if available
+    location: Optional[int] = None  # Kindle location
+    chapter: Optional[str] = None  # Chapter or section heading
+    note: Optional[str] = None  # User note attached to highlight
 
     def location_str(self) -> str:
         """Format location as readable string."""
@@ -52,31 +58,64 @@ class ParsedBook(BaseModel):
     highlights: list[Highlight] = Field(default_factory=list, description="All highlights")
     parsed_at: datetime = Field(default_factory=datetime.now, description="When parsing occurred")
 
+    # Highlights grouped by color; filled by the parser while it reads the
+    # export, or on first use for books built any other way
+    _by_color: Optional[dict[HighlightColor, list[Highlight]]] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_color_groups(
+        cls,
+        metadata: BookMetadata,
+        highlights: list[Highlight],
+        by_color: dict[HighlightColor, list[Highlight]],
+    ) -> "ParsedBook":
+        """Build a book whose highlights were already grouped by color.
+
+        Args:
+            metadata: Book metadata.
+            highlights: All highlights, in book order.
+            by_color: The same highlights grouped by color, each group in
+                book order, with a (possibly empty) group for every color.
+
+        Returns:
+            ParsedBook that reuses the grouping instead of recomputing it.
+        """
+        book = cls(metadata=metadata, highlights=highlights)
+        book._by_color = by_color
+        return book
+
+    def highlights_by_color(self) -> dict[HighlightColor, list[Highlight]]:
+        """Get highlights grouped by color, each group in book order.
+
+        The groups are shared with the book and must not be modified.
+        """
+        if self._by_color is None:
+            by_color: dict[HighlightColor, list[Highlight]] = {color: [] for color in HighlightColor}
+            for h in self.highlights:
+                by_color[h.color].append(h)
+            self._by_color = by_color
+        return self._by_color
+
     @property
     def yellow_highlights(self) -> list[Highlight]:
         """Get key concept highlights."""
-        return [h for h in self.highlights if h.color == HighlightColor.YELLOW]
+        return list(self.highlights_by_color()[HighlightColor.YELLOW])
 
     @property
     def pink_highlights(self) -> list[Highlight]:
         """Get action item highlights."""
-        return [h for h in self.highlights if h.color == HighlightColor.PINK]
+        return list(self.highlights_by_color()[HighlightColor.PINK])
 
     @property
     def blue_highlights(self) -> list[Highlight]:
         """Get beautiful quote highlights."""
-        return [h for h in self.highlights if h.color == HighlightColor.BLUE]
+        return list(self.highlights_by_color()[HighlightColor.BLUE])
 
     @property
     def orange_highlights(self) -> list[Highlight]:
         """Get disagreement highlights."""
-        return [h for h in self.highlights if h.color == HighlightColor.ORANGE]
+        return list(self.highlights_by_color()[HighlightColor.ORANGE])
 
     def highlight_counts(self) -> dict[str, int]:
         """Get counts by color."""
-        return {
-            "yellow": len(self.yellow_highlights),
-            "pink": len(self.pink_highlights),
-            "blue": len(self.blue_highlights),
-            "orange": len(self.orange_highlights),
-        }
+        return {color.value: len(group) for color, group in self.highlights_by_color().items()}
@@ -1,11 +1,13 @@
 """Processors for extracting concepts and actions from highlights."""
 
-from tsc.processors.concept_extractor import extract_concepts
-from tsc.processors.action_extractor import extract_actions
+from tsc.processors.concept_extractor import extract_concepts, extract_concepts_batch
+from tsc.processors.action_extractor import extract_actions, extract_actions_batch
 from tsc.processors.highlight_router import route_highlights
 
 __all__ = [
     "extract_concepts",
+    "extract_concepts_batch",
     "extract_actions",
+    "extract_actions_batch",
     "route_highlights",
 ]
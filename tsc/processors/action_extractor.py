@@ -1,12 +1,16 @@
 """Extract actionable tasks from pink highlights using LLM."""
 
-import json
-from typing import Optional
+from functools import partial
 
 from pydantic import BaseModel, Field
 
+from tsc.cache import disk_cache
 from tsc.parsers.models import Highlight, BookMetadata
-from tsc.integrations.llm_client import query_llm
+from tsc.processors.extraction import Extractor, extract, extract_batch, extract_chunk
+
+
+# Bump when the prompts below change so cached responses are not reused
+PROMPT_VERSION = 1
 
 
 class ExtractedAction(BaseModel):
@@ -59,6 +63,81 @@ Respond with valid JSON in this exact format:
 """
 
 
+ACTION_BATCH_EXTRACTION_PROMPT = """You are analyzing highlights from several books to extract actionable tasks from each.
+
+User Profile Context:
+{profile}
+
+{books}
+
+Task: For EACH book above, identify the TOP {limit} most impactful, actionable tasks from that book's highlights. Prioritize actions that:
+1. Are specific and achievable (not vague aspirations)
+2. Align with the user's current goals and responsibilities
+3. Have clear outcomes that can be verified
+4. Can realistically be acted upon within 1-4 weeks
+
+For each action, provide:
+- book_id: The id of the book the action comes from
+- title: A clear, action-oriented task title (start with verb, max 60 chars)
+- description: Detailed description including context and suggested approach
+- source_highlight: Index (0-based, within that book) of the highlight that inspired this action
+- priority: "high", "medium", or "low" based on potential impact and urgency
+- category: "work" (Hermes AI/Serranova), "personal" (growth/hobbies), "family", or "faith"
+
+Return at most {limit} actions per book (or fewer if highlights don't support meaningful actions).
+
+Respond with valid JSON in this exact format:
+{{
+    "actions": [
+        {{
+            "book_id": 0,
+            "title": "Action Title Starting with Verb",
+            "description": "Detailed description...",
+            "source_highlight": 0,
+            "priority": "high",
+            "category": "work"
+        }}
+    ]
+}}
+"""
+
+_PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+def _priority_rank(action: ExtractedAction) -> int:
+    """Sort key ranking actions by priority; unknown priorities rank as medium."""
+    return _PRIORITY_ORDER.get(action.priority, 1)
+
+
+def _action_key(action: ExtractedAction) -> str:
+    """Identity of an action across the parts of a split book."""
+    return action.title.casefold()
+
+
+def _rebase_action(action: ExtractedAction, offset: int) -> None:
+    """Map an action's source highlight index into the full list."""
+    action.source_highlight += offset
+
+
+def _keep_first(existing: ExtractedAction, duplicate: ExtractedAction) -> None:
+    """Keep the first of two actions with the same title."""
+
+
+_ACTIONS = Extractor(
+    model=ExtractedAction,
+    field="actions",
+    prompt=ACTION_EXTRACTION_PROMPT,
+    batch_prompt=ACTION_BATCH_EXTRACTION_PROMPT,
+    max_tokens=2048,
+    sort_key=_priority_rank,
+    reverse=False,
+    key=_action_key,
+    rebase=_rebase_action,
+    merge=_keep_first,
+)
+
+
+@disk_cache("actions", version=PROMPT_VERSION)
 async def extract_actions(
     highlights: list[Highlight],
     metadata: BookMetadata,
@@ -76,40 +155,40 @@ async def extract_actions(
     Returns:
         List of extracted actions, sorted by priority.
     """
-    if not highlights:
-        return []
-
-    # Format highlights for the prompt
-    highlights_text = "\n".join(
-        f"[{i}] {h.text}"
-        + (f" (Chapter: {h.chapter})" if h.chapter else "")
-        for i, h in enumerate(highlights)
-    )
+    return await extract(_ACTIONS, highlights, metadata, profile_content, max_actions)
 
-    prompt = ACTION_EXTRACTION_PROMPT.format(
-        title=metadata.title,
-        author=metadata.author,
-        profile=profile_content,
-        highlights=highlights_text,
-    )
 
-    response_text = await query_llm(prompt, max_tokens=2048)
+@disk_cache("actions_batch", version=PROMPT_VERSION)
+async def _extract_actions_chunk(
+    books: list[tuple[list[Highlight], BookMetadata]],
+    profile_content: str,
+    max_actions: int,
+) -> list[list[ExtractedAction]]:
+    """Extract actions for a chunk of books with a single LLM request."""
+    return await extract_chunk(_ACTIONS, books, profile_content, max_actions)
+
 
-    # Extract JSON from response (handle markdown code blocks)
-    if "```json" in response_text:
-        json_start = response_text.find("```json") + 7
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-    elif "```" in response_text:
-        json_start = response_text.find("```") + 3
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
+async def extract_actions_batch(
+    books: list[tuple[list[Highlight], BookMetadata]],
+    profile_content: str,
+    max_actions: int = 5,
+) -> list[list[ExtractedAction]]:
+    """Extract actionable tasks for several books in as few LLM requests as possible.
 
-    data = json.loads(response_text)
-    actions = [ExtractedAction(**a) for a in data["actions"][:max_actions]]
+    The profile and instructions are sent once per request instead of once
+    per book; books are grouped into requests of a few books each. Books
+    with too many highlights to share a request are extracted on their own.
 
-    # Sort by priority
-    priority_order = {"high": 0, "medium": 1, "low": 2}
-    actions.sort(key=lambda a: priority_order.get(a.priority, 1))
+    Args:
+        books: (pink highlights, metadata) pairs, one per book.
+        profile_content: User profile content for relevance.
+        max_actions: Maximum number of actions to extract per book.
 
-    return actions
+    Returns:
+        Extracted actions for each input book, in input order.
+    """
+    return await extract_batch(
+        books,
+        partial(extract_actions, profile_content=profile_content, max_actions=max_actions),
+        partial(_extract_actions_chunk, profile_content=profile_content, max_actions=max_actions),
+    )
@@ -1,12 +1,17 @@
 """Extract key concepts from yellow highlights using LLM."""
 
-import json
-from typing import Optional
+from functools import partial
+from operator import attrgetter
 
 from pydantic import BaseModel, Field
 
+from tsc.cache import disk_cache
 from tsc.parsers.models import Highlight, BookMetadata
-from tsc.integrations.llm_client import query_llm
+from tsc.processors.extraction import Extractor, extract, extract_batch, extract_chunk
+
+
+# Bump when the prompts below change so cached responses are not reused
+PROMPT_VERSION = 1
 
 
 class ExtractedConcept(BaseModel):
@@ -64,6 +69,77 @@ Respond with valid JSON in this exact format:
 """
 
 
+CONCEPT_BATCH_EXTRACTION_PROMPT = """You are analyzing highlights from several books to extract the most important concepts from each.
+
+User Profile Context:
+{profile}
+
+{books}
+
+Task: For EACH book above, identify the TOP {limit} most important concepts from that book's highlights. Prioritize concepts that:
+1. Are most relevant to the user's profile and goals
+2. Represent unique, actionable ideas from the book
+3. Have strong supporting evidence in the highlights
+4. Would be valuable as standalone knowledge notes
+
+For each concept, provide:
+- book_id: The id of the book the concept comes from
+- name: A short, memorable title (2-5 words)
+- description: A one-sentence summary
+- supporting_highlights: List of highlight indices (0-based, within that book) that support this concept
+- relevance_score: 0.0-1.0 indicating relevance to user's profile
+
+Return at most {limit} concepts per book (or fewer if the highlights don't support that many).
+
+Respond with valid JSON in this exact format:
+{{
+    "concepts": [
+        {{
+            "book_id": 0,
+            "name": "Concept Name",
+            "description": "One sentence description",
+            "supporting_highlights": [0, 2, 5],
+            "relevance_score": 0.85
+        }}
+    ]
+}}
+"""
+
+# Sort key ranking concepts by relevance
+_RELEVANCE = attrgetter("relevance_score")
+
+
+def _concept_key(concept: ExtractedConcept) -> str:
+    """Identity of a concept across the parts of a split book."""
+    return concept.name.casefold()
+
+
+def _rebase_concept(concept: ExtractedConcept, offset: int) -> None:
+    """Map a concept's supporting highlight indices into the full list."""
+    concept.supporting_highlights = [i + offset for i in concept.supporting_highlights]
+
+
+def _merge_concepts(existing: ExtractedConcept, duplicate: ExtractedConcept) -> None:
+    """Fold a concept found again in another part into the first one."""
+    existing.supporting_highlights.extend(duplicate.supporting_highlights)
+    existing.relevance_score = max(existing.relevance_score, duplicate.relevance_score)
+
+
+_CONCEPTS = Extractor(
+    model=ExtractedConcept,
+    field="concepts",
+    prompt=CONCEPT_EXTRACTION_PROMPT,
+    batch_prompt=CONCEPT_BATCH_EXTRACTION_PROMPT,
+    max_tokens=4096,
+    sort_key=_RELEVANCE,
+    reverse=True,
+    key=_concept_key,
+    rebase=_rebase_concept,
+    merge=_merge_concepts,
+)
+
+
+@disk_cache("concepts", version=PROMPT_VERSION)
 async def extract_concepts(
     highlights: list[Highlight],
     metadata: BookMetadata,
@@ -81,39 +157,40 @@ async def extract_concepts(
     Returns:
         List of extracted concepts, sorted by relevance.
     """
-    if not highlights:
-        return []
-
-    # Format highlights for the prompt
-    highlights_text = "\n".join(
-        f"[{i}] {h.text}"
-        + (f" (Chapter: {h.chapter})" if h.chapter else "")
-        for i, h in enumerate(highlights)
-    )
+    return await extract(_CONCEPTS, highlights, metadata, profile_content, max_concepts)
 
-    prompt = CONCEPT_EXTRACTION_PROMPT.format(
-        title=metadata.title,
-        author=metadata.author,
-        profile=profile_content,
-        highlights=highlights_text,
-    )
 
-    response_text = await query_llm(prompt, max_tokens=4096)
+@disk_cache("concepts_batch", version=PROMPT_VERSION)
+async def _extract_concepts_chunk(
+    books: list[tuple[list[Highlight], BookMetadata]],
+    profile_content: str,
+    max_concepts: int,
+) -> list[list[ExtractedConcept]]:
+    """Extract concepts for a chunk of books with a single LLM request."""
+    return await extract_chunk(_CONCEPTS, books, profile_content, max_concepts)
 
-    # Extract JSON from response (handle markdown code blocks)
-    if "```json" in response_text:
-        json_start = response_text.find("```json") + 7
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-    elif "```" in response_text:
-        json_start = response_text.find("```") + 3
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
 
-    data = json.loads(response_text)
-    concepts = [ExtractedConcept(**c) for c in data["concepts"][:max_concepts]]
+async def extract_concepts_batch(
+    books: list[tuple[list[Highlight], BookMetadata]],
+    profile_content: str,
+    max_concepts: int = 10,
+) -> list[list[ExtractedConcept]]:
+    """Extract key concepts for several books in as few LLM requests as possible.
 
-    # Sort by relevance score
-    concepts.sort(key=lambda c: c.relevance_score, reverse=True)
+    The profile and instructions are sent once per request instead of once
+    per book; books are grouped into requests of a few books each. Books
+    with too many highlights to share a request are extracted on their own.
 
-    return concepts
+    Args:
+        books: (yellow highlights, metadata) pairs, one per book.
+        profile_content: User profile content for relevance scoring.
+        max_concepts: Maximum number of concepts to extract per book.
+
+    Returns:
+        Extracted concepts for each input book, in input order.
+    """
+    return await extract_batch(
+        books,
+        partial(extract_concepts, profile_content=profile_content, max_concepts=max_concepts),
+        partial(_extract_concepts_chunk, profile_content=profile_content, max_concepts=max_concepts),
+    )
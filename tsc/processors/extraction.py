@@ -0,0 +1,275 @@
+"""LLM extraction flow shared by the concept and action extractors.
+
+Each extractor describes what it extracts with an ``Extractor``: its
+prompts, result model and how results are ranked and merged. The request
+splitting, cross-book batching and response parsing live here.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from tsc import jsonio
+from tsc.parsers.models import BookMetadata, Highlight
+from tsc.integrations.llm_client import query_llm
+
+
+# Books sent per batched request, bounded so the response fits in max_tokens
+_BOOKS_PER_REQUEST = 4
+
+# Most highlights sent in one request; larger books are split into several
+# requests that run concurrently
+_HIGHLIGHTS_PER_REQUEST = 150
+
+# Markdown code block, with or without a json language tag
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+T = TypeVar("T", bound=BaseModel)
+
+# A book's highlights paired with its metadata
+Book = tuple[list[Highlight], BookMetadata]
+
+
+@dataclass(frozen=True)
+class Extractor(Generic[T]):
+    """What one kind of extraction asks for and how its results combine.
+
+    Attributes:
+        model: Model each extracted item is validated into.
+        field: Key of the item list in the JSON response.
+        prompt: Single-book prompt, formatted with ``title``, ``author``,
+            ``profile`` and ``highlights``.
+        batch_prompt: Multi-book prompt, formatted with ``profile``,
+            ``books`` and ``limit``.
+        max_tokens: Response token budget per book.
+        sort_key: Key ranking items.
+        reverse: Whether higher sort keys rank first.
+        key: Identity of an item when merging the parts of a split book.
+        rebase: Shifts an item's highlight indices by a part's offset.
+        merge: Folds a duplicate item into the one kept.
+    """
+
+    model: type[T]
+    field: str
+    prompt: str
+    batch_prompt: str
+    max_tokens: int
+    sort_key: Callable[[T], Any]
+    reverse: bool
+    key: Callable[[T], str]
+    rebase: Callable[[T, int], None]
+    merge: Callable[[T, T], None]
+
+
+def _format_highlights(highlights: list[Highlight]) -> str:
+    """Format highlights as an indexed list for the prompt."""
+    return "\n".join(
+        f"[{i}] {h.text}"
+        + (f" (Chapter: {h.chapter})" if h.chapter else "")
+        for i, h in enumerate(highlights)
+    )
+
+
+def _parse_response(response_text: str) -> dict:
+    """Decode the JSON payload of an LLM response."""
+    # Extract JSON from response (handle markdown code blocks)
+    match = _JSON_FENCE.search(response_text)
+    if match:
+        response_text = match.group(1)
+
+    return jsonio.loads(response_text)
+
+
+def _split_highlights(highlights: list[Highlight]) -> list[tuple[int, list[Highlight]]]:
+    """Split highlights into near-equal request-sized parts.
+
+    Returns:
+        (offset, part) pairs, where offset is the index of the part's first
+        highlight in the full list.
+    """
+    n_parts = -(-len(highlights) // _HIGHLIGHTS_PER_REQUEST)
+    size = -(-len(highlights) // n_parts)
+    return [(i, highlights[i:i + size]) for i in range(0, len(highlights), size)]
+
+
+async def extract(
+    extractor: Extractor[T],
+    highlights: list[Highlight],
+    metadata: BookMetadata,
+    profile_content: str,
+    limit: int,
+) -> list[T]:
+    """Extract items from one book's highlights.
+
+    Books with more highlights than fit in one request are split into
+    concurrent requests whose results are merged.
+
+    Args:
+        extractor: What to extract.
+        highlights: The book's highlights of the relevant color.
+        metadata: Book metadata for context.
+        profile_content: User profile content for relevance.
+        limit: Maximum number of items to return.
+
+    Returns:
+        The best ``limit`` items, ranked by the extractor's sort key.
+    """
+    if not highlights:
+        return []
+
+    if len(highlights) <= _HIGHLIGHTS_PER_REQUEST:
+        items = await _query(extractor, highlights, metadata, profile_content, limit)
+    else:
+        items = await _extract_split(extractor, highlights, metadata, profile_content, limit)
+
+    items.sort(key=extractor.sort_key, reverse=extractor.reverse)
+
+    return items[:limit]
+
+
+async def _query(
+    extractor: Extractor[T],
+    highlights: list[Highlight],
+    metadata: BookMetadata,
+    profile_content: str,
+    limit: int,
+) -> list[T]:
+    """Extract items from highlights with a single LLM request."""
+    prompt = extractor.prompt.format(
+        title=metadata.title,
+        author=metadata.author,
+        profile=profile_content,
+        highlights=_format_highlights(highlights),
+    )
+
+    response_text = await query_llm(prompt, max_tokens=extractor.max_tokens)
+
+    data = _parse_response(response_text)
+    return [extractor.model(**item) for item in data[extractor.field][:limit]]
+
+
+async def _extract_split(
+    extractor: Extractor[T],
+    highlights: list[Highlight],
+    metadata: BookMetadata,
+    profile_content: str,
+    limit: int,
+) -> list[T]:
+    """Extract items from a large book's highlights in concurrent parts.
+
+    Highlight indices are mapped back to the full list, and items found in
+    several parts are merged by the extractor's key.
+    """
+    parts = _split_highlights(highlights)
+    part_results = await asyncio.gather(*(
+        _query(extractor, part, metadata, profile_content, limit)
+        for _, part in parts
+    ))
+
+    merged: dict[str, T] = {}
+    for (offset, _), items in zip(parts, part_results):
+        for item in items:
+            extractor.rebase(item, offset)
+            key = extractor.key(item)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = item
+            else:
+                extractor.merge(existing, item)
+
+    return list(merged.values())
+
+
+async def extract_chunk(
+    extractor: Extractor[T],
+    books: list[Book],
+    profile_content: str,
+    limit: int,
+) -> list[list[T]]:
+    """Extract items for a chunk of books with a single LLM request.
+
+    Args:
+        extractor: What to extract.
+        books: (highlights, metadata) pairs, one per book.
+        profile_content: User profile content for relevance.
+        limit: Maximum number of items per book.
+
+    Returns:
+        Ranked items for each input book, in input order.
+    """
+    books_text = "\n\n".join(
+        f"Book {book_id}: \"{metadata.title}\" by {metadata.author}\n"
+        f"Highlights:\n{_format_highlights(highlights)}"
+        for book_id, (highlights, metadata) in enumerate(books)
+    )
+
+    prompt = extractor.batch_prompt.format(
+        profile=profile_content,
+        books=books_text,
+        limit=limit,
+    )
+
+    response_text = await query_llm(prompt, max_tokens=extractor.max_tokens * len(books))
+
+    # Split the tagged items back out per book
+    data = _parse_response(response_text)
+    results: list[list[T]] = [[] for _ in books]
+    for item in data[extractor.field]:
+        book_id = item.pop("book_id", None)
+        if isinstance(book_id, int) and 0 <= book_id < len(books):
+            if len(results[book_id]) < limit:
+                results[book_id].append(extractor.model(**item))
+
+    for items in results:
+        items.sort(key=extractor.sort_key, reverse=extractor.reverse)
+
+    return results
+
+
+async def extract_batch(
+    books: list[Book],
+    extract_one: Callable[[list[Highlight], BookMetadata], Awaitable[list[T]]],
+    extract_books: Callable[[list[Book]], Awaitable[list[list[T]]]],
+) -> list[list[T]]:
+    """Extract items for several books in as few LLM requests as possible.
+
+    Books are grouped into requests of a few books each. Books with too
+    many highlights to share a request, or a lone book, are extracted on
+    their own.
+
+    Args:
+        books: (highlights, metadata) pairs, one per book.
+        extract_one: Extracts items for a single book.
+        extract_books: Extracts items for a chunk of books in one request.
+
+    Returns:
+        Extracted items for each input book, in input order.
+    """
+    results: list[list[T]] = [[] for _ in books]
+    pending = [i for i, (highlights, _) in enumerate(books) if highlights]
+    single = [i for i in pending if len(books[i][0]) > _HIGHLIGHTS_PER_REQUEST]
+    shared = [i for i in pending if len(books[i][0]) <= _HIGHLIGHTS_PER_REQUEST]
+    if len(shared) == 1:
+        single.append(shared.pop())
+
+    chunks = [
+        shared[i:i + _BOOKS_PER_REQUEST]
+        for i in range(0, len(shared), _BOOKS_PER_REQUEST)
+    ]
+    single_results, chunk_results = await asyncio.gather(
+        asyncio.gather(*(extract_one(*books[i]) for i in single)),
+        asyncio.gather(*(
+            extract_books([books[i] for i in chunk])
+            for chunk in chunks
+        )),
+    )
+    for i, items in zip(single, single_results):
+        results[i] = items
+    for chunk, items_per_book in zip(chunks, chunk_results):
+        for i, items in zip(chunk, items_per_book):
+            results[i] = items
+
+    return results
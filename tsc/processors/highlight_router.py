@@ -5,14 +5,38 @@ from dataclasses import dataclass
 from tsc.parsers.models import Highlight, HighlightColor, ParsedBook
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RoutedHighlights:
-    """Highlights organized by processing type."""
+    """Highlights organized by processing type.
 
-    concepts: list[Highlight]  # Yellow -> concept extraction
-    actions: list[Highlight]   # Pink -> action extraction
-    quotes: list[Highlight]    # Blue -> beautiful quotes
-    disagreements: list[Highlight]  # Orange -> disagreements
+    Highlights are held in one dict keyed by color; the named properties
+    give each processing type its bucket. The buckets are the book's own
+    color groups, so they are read-only. Every HighlightColor has a bucket,
+    so a new color only needs an enum member and, if it gets its own
+    processing, a property here.
+    """
+
+    by_color: dict[HighlightColor, list[Highlight]]
+
+    @property
+    def concepts(self) -> list[Highlight]:
+        """Yellow -> concept extraction."""
+        return self.by_color[HighlightColor.YELLOW]
+
+    @property
+    def actions(self) -> list[Highlight]:
+        """Pink -> action extraction."""
+        return self.by_color[HighlightColor.PINK]
+
+    @property
+    def quotes(self) -> list[Highlight]:
+        """Blue -> beautiful quotes."""
+        return self.by_color[HighlightColor.BLUE]
+
+    @property
+    def disagreements(self) -> list[Highlight]:
+        """Orange -> disagreements."""
+        return self.by_color[HighlightColor.ORANGE]
 
 
 def route_highlights(book: ParsedBook) -> RoutedHighlights:
@@ -30,9 +54,5 @@ def route_highlights(book: ParsedBook) -> RoutedHighlights:
     Returns:
         RoutedHighlights with highlights organized by processing type.
     """
-    return RoutedHighlights(
-        concepts=book.yellow_highlights,
-        actions=book.pink_highlights,
-        quotes=book.blue_highlights,
-        disagreements=book.orange_highlights,
-    )
+    # The parser groups highlights by color as it reads them; reuse that
+    return RoutedHighlights(by_color=book.highlights_by_color())